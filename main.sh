@@ -1,2 +1,2 @@
 python3 src/main.py
-cd docs && python3 -m http.server 8888
+python3 -m http.server 8888 --directory docs
@@ -0,0 +1,157 @@
+import errno
+import os
+import shutil
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+# ioctl request number for FICLONE (_IOW(0x94, 9, int)) on Linux
+FICLONE = 0x40049409
+
+# Strategies from cheapest to most expensive. A strategy that turns out not
+# to be supported falls back to the next one in the list; plain copy always
+# works.
+STRATEGIES = ["hardlink", "reflink", "copy_file_range", "sendfile", "copy"]
+
+# "auto" starts at reflink: hardlinks share the inode with static/, so an
+# edit made to the output would silently change the source, and has to be
+# asked for explicitly.
+AUTO_STRATEGY = "reflink"
+
+# Errors meaning "this mechanism is unavailable here", as opposed to a real
+# I/O failure that should abort the build
+UNSUPPORTED_ERRNOS = {
+    errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EINVAL,
+    errno.ENOSYS, errno.ENOTTY, errno.EPERM,
+}
+
+
+class UnsupportedStrategy(Exception):
+    pass
+
+
+def _hardlink(src_path, dest_path):
+    os.link(src_path, dest_path)
+
+
+def _reflink(src_path, dest_path):
+    if fcntl is None:
+        raise UnsupportedStrategy("reflink")
+    with open(src_path, 'rb') as src, open(dest_path, 'wb') as dest:
+        fcntl.ioctl(dest.fileno(), FICLONE, src.fileno())
+
+
+def _copy_file_range(src_path, dest_path):
+    if not hasattr(os, "copy_file_range"):
+        raise UnsupportedStrategy("copy_file_range")
+    with open(src_path, 'rb') as src, open(dest_path, 'wb') as dest:
+        remaining = os.fstat(src.fileno()).st_size
+        while remaining > 0:
+            copied = os.copy_file_range(src.fileno(), dest.fileno(), remaining)
+            if copied == 0:
+                break
+            remaining -= copied
+
+
+def _sendfile(src_path, dest_path):
+    if not hasattr(os, "sendfile"):
+        raise UnsupportedStrategy("sendfile")
+    with open(src_path, 'rb') as src, open(dest_path, 'wb') as dest:
+        size = os.fstat(src.fileno()).st_size
+        offset = 0
+        while offset < size:
+            sent = os.sendfile(dest.fileno(), src.fileno(), offset, size - offset)
+            if sent == 0:
+                break
+            offset += sent
+
+
+def _copy(src_path, dest_path):
+    shutil.copyfile(src_path, dest_path)
+
+
+_IMPLEMENTATIONS = {
+    "hardlink": _hardlink,
+    "reflink": _reflink,
+    "copy_file_range": _copy_file_range,
+    "sendfile": _sendfile,
+    "copy": _copy,
+}
+
+
+class AssetMaterializer:
+    """
+    Put a static asset into the output directory as cheaply as the platform
+    allows.
+
+    Starting from the requested strategy, each mechanism is tried in the
+    order of STRATEGIES. The first time one reports that it is unsupported
+    (different filesystem, no reflink support, missing syscall, ...) it is
+    disabled for the rest of the build and the next one is used.
+
+    Counters record how many files each strategy handled and how many bytes
+    never had to pass through userspace: hardlinks and reflinks share the
+    data outright, and copy_file_range/sendfile copy inside the kernel.
+    """
+
+    def __init__(self, strategy="auto"):
+        if strategy == "auto":
+            strategy = AUTO_STRATEGY
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown asset strategy: {strategy}")
+
+        self.strategy = strategy
+        self.chain = STRATEGIES[STRATEGIES.index(strategy):]
+        self.disabled = set()
+        self.files = {}
+        self.bytes_avoided = 0
+
+    def materialize(self, src_path, dest_path):
+        """
+        Create dest_path as a copy of src_path and return the strategy used.
+
+        Any existing dest_path is removed first; writing through it could
+        otherwise modify the source when it is a hardlink.
+        """
+        if os.path.lexists(dest_path):
+            os.remove(dest_path)
+
+        for name in self.chain:
+            if name in self.disabled:
+                continue
+            try:
+                _IMPLEMENTATIONS[name](src_path, dest_path)
+            except UnsupportedStrategy:
+                self._fall_back(name, dest_path)
+                continue
+            except OSError as e:
+                if e.errno not in UNSUPPORTED_ERRNOS:
+                    raise
+                self._fall_back(name, dest_path)
+                continue
+
+            if name != "hardlink":
+                # Keep the source mtime so the next sync sees an unchanged file
+                shutil.copystat(src_path, dest_path)
+            self._record(name, os.path.getsize(src_path))
+            return name
+
+        raise OSError(f"No asset strategy could copy {src_path}")
+
+    def _fall_back(self, name, dest_path):
+        self.disabled.add(name)
+        if os.path.lexists(dest_path):
+            os.remove(dest_path)
+
+    def _record(self, name, size):
+        self.files[name] = self.files.get(name, 0) + 1
+        if name != "copy":
+            self.bytes_avoided += size
+
+    def summary(self):
+        if not self.files:
+            return f"Asset strategy {self.strategy}: nothing to copy"
+        used = ", ".join(f"{name} ({count})" for name, count in self.files.items())
+        return f"Asset strategy {self.strategy}: used {used}, avoided copying {self.bytes_avoided} bytes"
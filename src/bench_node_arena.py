@@ -0,0 +1,83 @@
+"""
+Benchmark for NodeArena against the HTMLNode tree it is built from.
+
+For a page tree with one node per inline span, compares the memory held,
+the pickled size, the time to pickle and unpickle (as when sending a tree
+to or from a worker process) and the time to render.
+
+Usage:
+    python3 src/bench_node_arena.py [items]
+"""
+import pickle
+import sys
+import tracemalloc
+from time import perf_counter
+from leafnode import LeafNode
+from node_arena import NodeArena
+from parentnode import ParentNode
+
+
+def page_tree(items):
+    # Paragraphs and lists of inline spans, as text_node_to_html_node makes
+    blocks = []
+    for i in range(items):
+        blocks.append(ParentNode("p", [
+            LeafNode(None, f"Paragraph {i} with "),
+            LeafNode("b", "bold"),
+            LeafNode(None, " text and a "),
+            LeafNode("a", "link", {"href": f"/blog/post-{i}"}),
+            LeafNode(None, "."),
+        ]))
+        blocks.append(ParentNode("ul", [
+            ParentNode("li", [LeafNode(None, "item "), LeafNode("code", "code")])
+            for _ in range(3)
+        ]))
+    return ParentNode("div", blocks)
+
+
+def retained_bytes(make):
+    """Bytes still allocated after make() returns, with its result kept."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = make()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+
+def best_of(run, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        run()
+        times.append(perf_counter() - start)
+    return min(times)
+
+
+def main(items=10_000):
+    tree_bytes, tree = retained_bytes(lambda: page_tree(items))
+    arena_bytes, arena = retained_bytes(lambda: NodeArena.from_node(page_tree(items)))
+    assert arena.to_html() == tree.to_html()
+
+    rows = []
+    for name, value in (("tree", tree), ("arena", arena)):
+        pickled = pickle.dumps(value)
+        rows.append((
+            name,
+            tree_bytes if value is tree else arena_bytes,
+            len(pickled),
+            best_of(lambda: pickle.loads(pickle.dumps(value))),
+            best_of(value.to_html),
+        ))
+
+    print(f"{items} paragraphs and lists, {len(arena)} arena ops")
+    print(f"{'':<8}{'memory':>12}{'pickled':>12}{'pickle+load':>14}{'to_html':>12}")
+    for name, memory, size, round_trip, render in rows:
+        print(f"{name:<8}{memory / 1e6:>10.1f}MB{size / 1e6:>10.1f}MB"
+              f"{round_trip * 1000:>12.1f}ms{render * 1000:>10.1f}ms")
+    print(f"from_node: {best_of(lambda: NodeArena.from_node(tree)) * 1000:.1f}ms, "
+          f"to_node: {best_of(arena.to_node) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
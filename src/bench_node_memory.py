@@ -0,0 +1,61 @@
+"""
+Memory benchmark for the node classes.
+
+Measures the bytes allocated per TextNode, LeafNode and ParentNode with
+tracemalloc, for the slotted classes and for subclasses that add back a
+per-instance __dict__ (i.e. the classes as they were before __slots__).
+
+Usage:
+    python3 src/bench_node_memory.py [count]
+"""
+import sys
+import tracemalloc
+from leafnode import LeafNode
+from parentnode import ParentNode
+from textnode import TextNode, TextType
+
+
+# Subclasses without __slots__ get a __dict__ again, like the old classes
+class DictTextNode(TextNode):
+    pass
+
+
+class DictLeafNode(LeafNode):
+    pass
+
+
+class DictParentNode(ParentNode):
+    pass
+
+
+def bytes_per_node(make, count):
+    """Average bytes allocated by each of count calls to make(i)."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    nodes = [make(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Leave out the list holding the nodes
+    return (after - before - sys.getsizeof(nodes)) / count
+
+
+def main(count=100_000):
+    # Shared field values, so only the nodes themselves are measured
+    text = "some text"
+    children = []
+    props = {"href": "/"}
+    cases = [
+        ("TextNode", lambda cls: lambda i: cls(text, TextType.PLAIN), TextNode, DictTextNode),
+        ("LeafNode", lambda cls: lambda i: cls("a", text, props), LeafNode, DictLeafNode),
+        ("ParentNode", lambda cls: lambda i: cls("p", children), ParentNode, DictParentNode),
+    ]
+
+    print(f"{'Node':<12}{'with __dict__':>16}{'with __slots__':>16}{'saved':>8}")
+    for name, factory, slotted, unslotted in cases:
+        before = bytes_per_node(factory(unslotted), count)
+        after = bytes_per_node(factory(slotted), count)
+        print(f"{name:<12}{before:>14.1f} B{after:>14.1f} B{1 - after / before:>8.0%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,72 @@
+"""
+Benchmark for ParentNode.to_html on wide and deep trees.
+
+Compares ParentNode.to_html with the recursive renderer it replaced,
+which concatenated each child's HTML with += and recursed once per level.
+to_html also recurses, into one shared list of parts, so wide trees take
+about as long; past MAX_RECURSION_DEPTH levels it switches to an explicit
+stack, so it renders trees of any depth.
+
+Usage:
+    python3 src/bench_to_html.py
+"""
+import sys
+from time import perf_counter
+from leafnode import LeafNode
+from parentnode import ParentNode
+
+
+def recursive_to_html(node):
+    """The previous ParentNode.to_html, for comparison."""
+    if not isinstance(node, ParentNode):
+        return node.to_html()
+    children_html = ""
+    for child in node.children:
+        children_html += recursive_to_html(child)
+    return f"<{node.tag}{node.props_to_html()}>{children_html}</{node.tag}>"
+
+
+def wide_tree(items):
+    # A list with one <li> per item, each holding some inline content
+    return ParentNode("ul", [
+        ParentNode("li", [LeafNode(None, f"item {i} "), LeafNode("b", "bold")])
+        for i in range(items)
+    ])
+
+
+def deep_tree(depth):
+    node = LeafNode(None, "leaf")
+    for _ in range(depth):
+        node = ParentNode("div", [node])
+    return node
+
+
+def best_of(render, node, repeat=5):
+    times = []
+    for _ in range(repeat):
+        start = perf_counter()
+        render(node)
+        times.append(perf_counter() - start)
+    return min(times)
+
+
+def main():
+    print(f"{'Tree':<28}{'recursive':>12}{'to_html':>12}")
+    for name, node in [("wide, 10k <li>", wide_tree(10_000)),
+                       ("wide, 100k <li>", wide_tree(100_000)),
+                       ("deep, 500 levels", deep_tree(500)),
+                       ("deep, 100k levels", deep_tree(100_000))]:
+        if "100k levels" not in name:
+            # Too deep for the recursive renderer to produce a reference
+            assert node.to_html() == recursive_to_html(node)
+        try:
+            recursive = f"{best_of(recursive_to_html, node) * 1000:>10.2f}ms"
+        except RecursionError:
+            recursive = f"{'RecursionError':>12}"
+        current = f"{best_of(ParentNode.to_html, node) * 1000:>10.2f}ms"
+        print(f"{name:<28}{recursive}{current}")
+    print(f"(recursion limit: {sys.getrecursionlimit()})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+import json
+import os
+from collections import OrderedDict
+from time import perf_counter
+from build_manifest import GENERATOR_VERSION
+from build_timings import current_page
+from rawhtmlnode import RawHTMLNode
+
+# Bump whenever the layout of a block cache file changes
+CACHE_FORMAT = 2
+
+
+def collect_root_urls(node):
+    """
+    Gather the root-relative href/src URLs in an HTML node tree, i.e. the
+    links and images that may point at files copied from static/.
+    """
+    urls = []
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, RawHTMLNode):
+            urls.extend(current.urls)
+        if current.props:
+            for key in ("href", "src"):
+                url = current.props.get(key)
+                if url and url.startswith("/"):
+                    urls.append(url)
+        if current.children:
+            stack.extend(current.children)
+    return urls
+
+
+class CachedBlockNode(RawHTMLNode):
+    """
+    Stands in for the subtree of a block whose HTML was rendered once and
+    cached, along with the root-relative URLs of that subtree and the
+    parse warnings raised while converting it.
+    """
+
+    __slots__ = ("warnings",)
+
+    def __init__(self, html, urls, warnings=()):
+        super().__init__(html, urls)
+        self.warnings = warnings
+
+
+class BlockCache:
+    """
+    Bounded LRU cache of rendered block HTML, keyed by the hash of the
+    block's markdown text (hash_text(block), computed once per block by
+    the caller).
+
+    Pages often share identical blocks (disclaimers, footers, standard
+    lists). The first time a block is seen its subtree is rendered once and
+    stored; every later occurrence, on any page, is served from the cache
+    without classifying or converting it again. The block HTML does not
+    depend on the basepath or template, which are applied per page.
+    The parse warnings raised while converting a block are stored with it
+    and replayed by markdown_to_html_node on every hit, so each page that
+    contains the block reports them against its own file and line.
+
+    With a path, the cache is loaded from and saved to a JSON file so it
+    survives between builds. A file written by another GENERATOR_VERSION
+    or CACHE_FORMAT is ignored.
+
+    A miss costs rendering the block up front, so the cache only pays off
+    on sites whose pages share blocks; the build leaves it off by default.
+
+    Example:
+        cache = BlockCache(max_entries=1024)
+        key = hash_text(block)
+        node = cache.get(key) or cache.put(key, block_to_html_node(...), warnings)
+    """
+
+    def __init__(self, max_entries=4096, path=None):
+        self.max_entries = max_entries
+        self.path = path
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # Keys added since the last take_new(), for merging worker caches
+        self._new = []
+
+        if path is not None and os.path.exists(path):
+            with open(path, 'r') as f:
+                data = json.load(f)
+            if data.get("version") == GENERATOR_VERSION and data.get("format") == CACHE_FORMAT:
+                for key, html, urls, warnings in data.get("blocks", [])[-max_entries:]:
+                    self.entries[key] = (html, urls, warnings)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """
+        Look a block up by the hash of its text.
+
+        Returns:
+            CachedBlockNode: The cached rendering, or None on a miss
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return CachedBlockNode(*entry)
+
+    def put(self, key, node, warnings=()):
+        """
+        Render a block's node and cache the result under the hash of the
+        block's text, along with the messages of the parse warnings raised
+        while converting it. The rendering is timed as "to_html" for the
+        page being generated, like the rest of the page's rendering.
+
+        Returns:
+            CachedBlockNode: The rendered block, to use in place of node so
+            the subtree is not rendered a second time
+        """
+        timings = current_page()
+        start = perf_counter() if timings else 0
+        html = node.to_html()
+        if timings:
+            timings.add("to_html", perf_counter() - start)
+        urls = collect_root_urls(node)
+        warnings = list(warnings)
+        self._store(key, html, urls, warnings)
+        return CachedBlockNode(html, urls, warnings)
+
+    def _store(self, key, html, urls, warnings):
+        if self.max_entries <= 0:
+            return
+        self.entries[key] = (html, urls, warnings)
+        self.entries.move_to_end(key)
+        self._new.append(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def take_new(self):
+        """
+        Return the entries added since the last call, with the hit and miss
+        counts, and reset them. Used to send a worker's additions back to
+        the parent process, which folds them in with merge().
+        """
+        new = [(key, *self.entries[key]) for key in self._new if key in self.entries]
+        counts = (self.hits, self.misses)
+        self._new = []
+        self.hits = self.misses = 0
+        return new, counts
+
+    def merge(self, taken):
+        new, (hits, misses) = taken
+        for key, html, urls, warnings in new:
+            self._store(key, html, urls, warnings)
+        self.hits += hits
+        self.misses += misses
+
+    def save(self):
+        data = {
+            "format": CACHE_FORMAT,
+            "version": GENERATOR_VERSION,
+            "blocks": [[key, *entry] for key, entry in self.entries.items()],
+        }
+        with open(self.path, 'w') as f:
+            json.dump(data, f)
+
+    def summary(self):
+        lookups = self.hits + self.misses
+        rate = self.hits / lookups if lookups else 0.0
+        return (f"Block cache: {self.hits} hits, {self.misses} misses ({rate:.0%}), "
+                f"{len(self.entries)}/{self.max_entries} entries")
@@ -0,0 +1,332 @@
+import re
+from build_timings import current_page
+from parse_warnings import current_warnings, warn
+from time import perf_counter
+
+# A run of one or more blank (empty or whitespace-only) lines, from the
+# newline ending the line before it to the newline ending its last line
+BLANK_LINES = re.compile(r"(\n(?:[^\S\n]*\n)+)")
+
+# A blank line that is not empty, which a split on "\n\n" would miss
+WHITESPACE_LINE = re.compile(r"\n[^\S\n]+\n")
+
+# A line starting with ```, after any indentation
+FENCE_LINE = re.compile(r"^[^\S\n]*```", re.MULTILINE)
+
+# The first line starting with "# "
+TITLE_LINE = re.compile(r"^# (.*)", re.MULTILINE)
+
+
+def iter_lines(source):
+    """
+    Yield the lines of a markdown source without their line endings.
+
+    Args:
+        source (str or file): Markdown text, or a text file object to read
+            line by line
+
+    Strings are walked with str.find rather than split, so no list of
+    lines is built for the whole document. A trailing \r (Windows line
+    endings) is dropped as well.
+    """
+    if isinstance(source, str):
+        position = 0
+        while True:
+            newline = source.find("\n", position)
+            if newline == -1:
+                # Like a file, a final newline does not start another line
+                if position < len(source):
+                    yield source[position:].removesuffix("\r")
+                return
+            yield source[position:newline].removesuffix("\r")
+            position = newline + 1
+    else:
+        for line in source:
+            yield line.rstrip("\r\n")
+
+
+def _opens_fence(line):
+    # A ``` line that is not also closed on the same line ("```code```")
+    stripped = line.strip()
+    return stripped.startswith("```") and not (len(stripped) >= 6 and stripped.endswith("```"))
+
+
+def _closes_fence(piece):
+    # A line starting with ```, or a block ending in ``` as classify_block
+    # accepts for code ("```\ncode```")
+    return piece.rstrip().endswith("```") or FENCE_LINE.search(piece)
+
+
+def iter_blocks(source):
+    """
+    Split a markdown document into blocks, yielding them one at a time.
+
+    Blocks are separated by blank (empty or whitespace-only) lines and
+    stripped of surrounding whitespace. A block that opens with a ```
+    fence runs at least until the closing fence, so code containing blank
+    lines stays in one block. If the fence is never closed, a parse warning
+    is recorded and the rest of the document is split as usual.
+
+    Args:
+        source (str or file): Markdown text or a text file object
+
+    Yields:
+        str: Each non-empty block, in document order
+
+    Example:
+        Input: "# Title\n\n```\na\n\nb\n```"
+        Yields: "# Title", then "```\na\n\nb\n```"
+    """
+    if isinstance(source, str):
+        _, pieces, _, unclosed = _split_text(source)
+        if unclosed is None:
+            # Without line numbers to count, the blocks are just the
+            # non-empty pieces
+            return filter(None, map(str.strip, pieces))
+    return (block for _, block in iter_numbered_blocks(source))
+
+
+class PageMetadata:
+    """
+    Facts about a document gathered as a side product of scanning it, so
+    nothing has to make a second pass over the source.
+
+    Attributes:
+        title (str): Text of the first line starting with "# ", stripped,
+            as extract_title would return it (None if there is none)
+        title_line (int): Line number of that line
+        lines (int): Number of lines in the document
+        blocks (int): Number of blocks in the document
+    """
+
+    def __init__(self):
+        self.title = None
+        self.title_line = None
+        self.lines = 0
+        self.blocks = 0
+
+    def require_title(self):
+        """Return the title, raising like extract_title if there is none."""
+        if self.title is None:
+            raise Exception("No h1 header found in markdown")
+        return self.title
+
+
+def iter_numbered_blocks(source, metadata=None):
+    """
+    Like iter_blocks, but yield (line number, block) pairs, where the line
+    number (counting from 1) is that of the block's first line.
+
+    If a PageMetadata is given, it is filled in during the scan; its
+    counts are complete once the generator is exhausted.
+
+    A string is cut at its runs of blank lines in one go (with str.split
+    when every blank line is empty), and only the pieces containing ```
+    are searched line by line for fences. A file object is read one line
+    at a time instead, so only the current block is held in memory.
+    """
+    if isinstance(source, str):
+        return _iter_text_blocks(source, metadata)
+    return _iter_line_blocks(source, metadata)
+
+
+def _split_text(text):
+    """
+    Cut a markdown string at its runs of blank lines, joining the pieces
+    of fenced code blocks back together.
+
+    Returns:
+        tuple: The line number of the first piece, the pieces, the runs of
+            blank lines after each piece ("" after the last one), and the
+            index of the piece whose fence is unclosed (None if none is)
+    """
+    # Like iter_lines, drop the \r of Windows line endings
+    if "\r" in text:
+        text = text.replace("\r\n", "\n")
+    # Without leading blank lines, no piece below starts with a newline,
+    # so each block starts on the first line of its piece
+    body = text.lstrip()
+    first_line = text.count("\n", 0, len(text) - len(body)) + 1
+
+    # Most documents only separate blocks by single empty lines, which
+    # str.split finds fastest
+    if "\n\n\n" in body or WHITESPACE_LINE.search(body):
+        pieces = BLANK_LINES.split(body)
+        separators = pieces[1::2]
+        pieces = pieces[0::2]
+    else:
+        pieces = body.split("\n\n")
+        separators = ["\n\n"] * (len(pieces) - 1)
+    separators.append("")
+
+    unclosed = None
+    if "```" in body:
+        pieces, separators, unclosed = _merge_fences(pieces, separators)
+    return first_line, pieces, separators, unclosed
+
+
+def _iter_text_blocks(text, metadata):
+    timings = current_page()
+    start = perf_counter() if timings else 0
+
+    if metadata is not None:
+        title = TITLE_LINE.search(text)
+        if title is not None:
+            metadata.title = title.group(1).strip()
+            metadata.title_line = text.count("\n", 0, title.start()) + 1
+
+    first_line, pieces, separators, unclosed = _split_text(text)
+    if metadata is not None:
+        metadata.lines = text.count("\n") + (not text.endswith("\n") and bool(text))
+    # The split is done up front and counts as markdown_to_blocks; the
+    # blocks are then numbered one at a time as they are consumed
+    if timings:
+        timings.add("markdown_to_blocks", perf_counter() - start)
+
+    line_number = first_line
+    blocks = 0
+    for index, (piece, separator) in enumerate(zip(pieces, separators)):
+        if index == unclosed:
+            # Report the unclosed fence once the blocks before it are done
+            _warn_unclosed_fence(line_number)
+        block = piece.strip()
+        if block:
+            blocks += 1
+            yield line_number, block
+        line_number += piece.count("\n") + separator.count("\n")
+    if metadata is not None:
+        metadata.blocks = blocks
+
+
+def _merge_fences(pieces, separators):
+    """
+    Join each piece that opens a ``` fence with the pieces up to the one
+    holding its closing fence, so blank lines in code stay in the block.
+
+    Only pieces containing ``` can open or close a fence, and only those
+    are searched, line by line. If a fence is never closed, its piece is
+    left as ordinary text.
+
+    Returns:
+        tuple: The merged pieces and separators, and the index of the piece
+            whose fence is unclosed (None if every fence is closed)
+    """
+    candidates = [index for index, piece in enumerate(pieces) if "```" in piece]
+    merged_pieces = []
+    merged_separators = []
+    copied = 0
+    position = 0
+    while position < len(candidates):
+        index = candidates[position]
+        position += 1
+        block = pieces[index].strip()
+        first_line_end = block.find("\n")
+        first_line = block if first_line_end == -1 else block[:first_line_end]
+        if not block.startswith("```") or not _opens_fence(first_line):
+            continue
+        if first_line_end != -1 and (block.endswith("```")
+                                     or FENCE_LINE.search(block, first_line_end + 1)):
+            continue
+        # The closing fence is in a later piece holding ```
+        while position < len(candidates) and not _closes_fence(pieces[candidates[position]]):
+            position += 1
+        if position == len(candidates):
+            # Nothing after an unclosed fence can open another one
+            unclosed = len(merged_pieces) + index - copied
+            merged_pieces.extend(pieces[copied:])
+            merged_separators.extend(separators[copied:])
+            return merged_pieces, merged_separators, unclosed
+        end = candidates[position]
+        position += 1
+        merged_pieces.extend(pieces[copied:index])
+        merged_separators.extend(separators[copied:index])
+        merged_pieces.append("".join(
+            [part for pair in zip(pieces[index:end], separators[index:end]) for part in pair]
+            + [pieces[end]]))
+        merged_separators.append(separators[end])
+        copied = end + 1
+    merged_pieces.extend(pieces[copied:])
+    merged_separators.extend(separators[copied:])
+    return merged_pieces, merged_separators, None
+
+
+def _iter_line_blocks(source, metadata):
+    # Time spent here between yields counts as markdown_to_blocks
+    timings = current_page()
+    start = perf_counter() if timings else 0
+
+    lines = []
+    first_line = 0
+    line_number = 0
+    blocks = 0
+    in_fence = False
+    # Line of an unclosed fence being re-read as ordinary text
+    literal_fence_line = None
+    # Look for the title only until it is found
+    find_title = metadata is not None
+    numbered_lines = enumerate(iter_lines(source), 1)
+    while True:
+        for line_number, line in numbered_lines:
+            if find_title and line.startswith("# "):
+                metadata.title = line[2:].strip()
+                metadata.title_line = line_number
+                find_title = False
+
+            if in_fence:
+                if line.strip() or not _ends_fence(lines):
+                    lines.append(line)
+                    if line.strip().startswith("```"):
+                        in_fence = False
+                    continue
+                # A blank line after a line ending in ``` closes the fence
+                in_fence = False
+
+            if not line.strip():
+                if lines:
+                    block = "\n".join(lines).strip()
+                    lines = []
+                    blocks += 1
+                    if timings:
+                        timings.add("markdown_to_blocks", perf_counter() - start)
+                    yield first_line, block
+                    start = perf_counter() if timings else 0
+                continue
+
+            if not lines:
+                first_line = line_number
+                in_fence = line_number != literal_fence_line and _opens_fence(line)
+            lines.append(line)
+
+        if not in_fence or _ends_fence(lines):
+            break
+
+        # The document ended inside a fence that was never closed. Rather
+        # than swallow the rest of the document, read the lines from the
+        # fence on again as ordinary blocks, split at blank lines
+        _warn_unclosed_fence(first_line)
+        in_fence = False
+        literal_fence_line = first_line
+        numbered_lines = enumerate(lines, first_line)
+        lines = []
+
+    if lines:
+        blocks += 1
+    if metadata is not None:
+        metadata.lines = line_number
+        metadata.blocks = blocks
+    if timings:
+        timings.add("markdown_to_blocks", perf_counter() - start)
+    if lines:
+        yield first_line, "\n".join(lines).strip()
+
+
+def _ends_fence(lines):
+    # Whether the block's lines, from its opening fence on, end in ```
+    return len(lines) > 1 and lines[-1].rstrip().endswith("```")
+
+
+def _warn_unclosed_fence(line):
+    warnings = current_warnings()
+    if warnings is not None:
+        warnings.line = line
+    warn("unclosed ``` code fence; the text after it is parsed as ordinary blocks")
@@ -1,3 +1,4 @@
+from collections import namedtuple
 from enum import Enum
 
 
@@ -16,6 +17,11 @@ class BlockType(Enum):
     ORDERED_LIST = "ordered_list"
 
 
+# A classified block: its type, its lines with markdown prefixes removed
+# (see classify_block) and the heading level (0 for other types)
+ClassifiedBlock = namedtuple("ClassifiedBlock", ["block_type", "lines", "level"])
+
+
 def block_to_block_type(block):
     """
     Determine the type of a markdown block.
@@ -45,46 +51,87 @@ def block_to_block_type(block):
         "1. First item" → BlockType.ORDERED_LIST
         "Plain text" → BlockType.PARAGRAPH
     """
+    return classify_block(block).block_type
+
+
+def classify_block(block):
+    """
+    Determine the type of a markdown block and split out its content.
+    
+    Same rules as block_to_block_type, but the block is scanned only once:
+    the lines examined while classifying are kept, with their markdown
+    prefixes removed, so the HTML converters never split the block again.
+    
+    Args:
+        block (str): A single block of markdown text (whitespace already stripped)
+        
+    Returns:
+        ClassifiedBlock: (block_type, lines, level) where lines are
+        - HEADING: [heading text], level is the number of #'s
+        - CODE: the lines between the ``` fences
+        - QUOTE: each line without its "> " or ">"
+        - UNORDERED_LIST: each item without its "- "
+        - ORDERED_LIST: each item without its "1. ", "2. ", ...
+        - PARAGRAPH: the block's lines unchanged
+        
+    Example:
+        "- one\n- two" → ClassifiedBlock(BlockType.UNORDERED_LIST, ["one", "two"], 0)
+    """
+    first = block[:1]
     
     # Check for HEADING (1-6 # characters + space + content)
-    if block.startswith('#'):
+    if first == '#':
         # Count consecutive # characters from the start
-        hash_count = 0
-        for char in block:
-            if char == '#':
-                hash_count += 1
-            else:
-                break
+        hash_count = len(block) - len(block.lstrip('#'))
         
         # Valid heading: 1-6 #'s followed by a space and actual content
-        if (1 <= hash_count <= 6 and 
-            len(block) > hash_count and 
-            block[hash_count] == ' ' and
+        if (hash_count <= 6 and
+            block.startswith(' ', hash_count) and
             len(block) > hash_count + 1):  # Must have content after space
-            return BlockType.HEADING
-    
-    # Check for CODE block (starts and ends with ```)
-    if block.startswith('```') and block.endswith('```') and len(block) >= 6:
-        return BlockType.CODE
+            return ClassifiedBlock(BlockType.HEADING, [block[hash_count + 1:]], hash_count)
+        return ClassifiedBlock(BlockType.PARAGRAPH, block.split('\n'), 0)
     
-    # Check for QUOTE (every line starts with >)
     lines = block.split('\n')
-    if all(line.startswith('>') for line in lines):
-        return BlockType.QUOTE
     
-    # Check for UNORDERED_LIST (every line starts with "- ")
-    if all(line.startswith('- ') for line in lines):
-        return BlockType.UNORDERED_LIST
+    # Check for CODE block (starts and ends with ```)
+    if first == '`' and block.startswith('```') and block.endswith('```') and len(block) >= 6:
+        return ClassifiedBlock(BlockType.CODE, lines[1:-1], 0)
     
-    # Check for ORDERED_LIST (every line starts with number + ". ", incrementing from 1)
-    if _is_ordered_list(lines):
-        return BlockType.ORDERED_LIST
+    # QUOTE, UNORDERED_LIST and ORDERED_LIST lines start with different
+    # characters, so the first character picks the only candidate and a
+    # single pass over the lines both checks it and strips the prefixes
+    if first == '>':
+        # Every line starts with >, optionally followed by a space
+        stripped = []
+        for line in lines:
+            if line.startswith('> '):
+                stripped.append(line[2:])
+            elif line.startswith('>'):
+                stripped.append(line[1:])
+            else:
+                break
+        else:
+            return ClassifiedBlock(BlockType.QUOTE, stripped, 0)
+    elif first == '-':
+        # Every line starts with "- "
+        stripped = []
+        for line in lines:
+            if not line.startswith('- '):
+                break
+            stripped.append(line[2:])
+        else:
+            return ClassifiedBlock(BlockType.UNORDERED_LIST, stripped, 0)
+    elif first == '1':
+        # Every line starts with number + ". ", incrementing from 1
+        stripped = _ordered_list_items(lines)
+        if stripped is not None:
+            return ClassifiedBlock(BlockType.ORDERED_LIST, stripped, 0)
     
     # Default: PARAGRAPH
-    return BlockType.PARAGRAPH
+    return ClassifiedBlock(BlockType.PARAGRAPH, lines, 0)
 
 
-def _is_ordered_list(lines):
+def _ordered_list_items(lines):
     """
     Helper function to check if lines form a valid ordered list.
     
@@ -97,13 +144,15 @@ def _is_ordered_list(lines):
         lines (list): List of lines to check
         
     Returns:
-        bool: True if lines form a valid ordered list
+        list: The item texts after each "N. ", or None if the lines are not
+        a valid ordered list
     """
-    for i, line in enumerate(lines):
-        expected_number = i + 1  # Should be 1, 2, 3, ...
-        expected_prefix = f"{expected_number}. "
+    items = []
+    for i, line in enumerate(lines, 1):
+        number = str(i)  # Should be 1, 2, 3, ...
         
-        if not line.startswith(expected_prefix):
-            return False
+        if not (line.startswith(number) and line.startswith('. ', len(number))):
+            return None
+        items.append(line[len(number) + 2:])
     
-    return True
\ No newline at end of file
+    return items
@@ -0,0 +1,220 @@
+import hashlib
+import json
+import os
+
+# Bump whenever a change to the generator alters the HTML it produces,
+# so that every page recorded by an older version gets rebuilt.
+GENERATOR_VERSION = "2"
+
+# Bump whenever the layout of the manifest file changes; pages recorded in
+# another format are ignored, so every page is rebuilt once.
+MANIFEST_FORMAT = 2
+
+
+def hash_text(text):
+    """Return the hex SHA-256 digest of a string."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def hash_file(path):
+    """Return the hex SHA-256 digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BuildManifest:
+    """
+    Persistent record of the inputs each generated page was built from.
+
+    Every output path maps to a fingerprint of its inputs: the hash of the
+    source markdown, the hash of the template, the basepath and the
+    generator version, plus the size and mtime of each static asset the
+    page references. A page whose fingerprint is unchanged since the last
+    build (and whose output file still exists) does not need regenerating.
+
+    Entries are only kept for outputs seen during the current build, so
+    pages whose source was deleted drop out of the manifest on save.
+
+    With an output_dir, entries are keyed by the page's path relative to
+    it, so the same page matches whether it is built into docs/ or into an
+    --atomic staging directory.
+
+    The manifest also remembers which static assets were synced into the
+    output directory, so assets whose source disappears can be removed
+    without touching generated pages.
+    """
+
+    def __init__(self, path=None, static_dir="static", output_dir=None):
+        self.path = path
+        self.static_dir = static_dir
+        self.output_dir = output_dir
+        self.entries = {}
+        self.rebuilt = 0
+        self.skipped = 0
+        self.static_files = []
+        self.explain = False
+        self._seen = {}
+        self._template_hashes = {}
+        self._asset_signatures = {}
+
+        if path is not None and os.path.exists(path):
+            with open(path, 'r') as f:
+                data = json.load(f)
+            if data.get("format") == MANIFEST_FORMAT:
+                self.entries = data.get("pages", {})
+            self.static_files = data.get("static", [])
+
+    def key(self, dest_path):
+        """The entry key of an output path."""
+        if self.output_dir is None:
+            return dest_path
+        return os.path.relpath(dest_path, self.output_dir)
+
+    def output_path(self, key):
+        """The output path of an entry key, under the current output_dir."""
+        if self.output_dir is None:
+            return key
+        return os.path.join(self.output_dir, key)
+
+    def _template_hash(self, template_path):
+        # The template is shared by every page, so hash it only once per build
+        if template_path not in self._template_hashes:
+            self._template_hashes[template_path] = hash_file(template_path)
+        return self._template_hashes[template_path]
+
+    def _asset_signature(self, asset_path):
+        # Assets can be large, so they are tracked by size and mtime rather
+        # than hashed, and each one is stat()ed at most once per build
+        if asset_path not in self._asset_signatures:
+            try:
+                stat = os.stat(asset_path)
+                signature = f"{stat.st_size}:{stat.st_mtime_ns}"
+            except FileNotFoundError:
+                signature = None
+            self._asset_signatures[asset_path] = signature
+        return self._asset_signatures[asset_path]
+
+    def asset_path_for(self, url):
+        """Map a root-relative URL to the static file it refers to, if any."""
+        if not url.startswith("/") or url.startswith("//"):
+            return None
+        path = os.path.join(self.static_dir, url.split("?")[0].split("#")[0].lstrip("/"))
+        if os.path.isfile(path):
+            return path
+        return None
+
+    def fingerprint(self, from_path, markdown_content, template_path, basepath):
+        return {
+            "source": hash_text(markdown_content),
+            "source_path": from_path,
+            "template": self._template_hash(template_path),
+            "template_path": template_path,
+            "basepath": basepath,
+            "version": GENERATOR_VERSION,
+        }
+
+    def explain_rebuild(self, dest_path, fingerprint):
+        """
+        List the reasons dest_path has to be regenerated.
+
+        Returns:
+            list: Human-readable reasons; empty if the page is up to date
+        """
+        previous = self.entries.get(self.key(dest_path))
+        if previous is None:
+            return ["new page"]
+
+        reasons = []
+        if not os.path.exists(dest_path):
+            reasons.append("output missing")
+        if previous.get("source") != fingerprint["source"]:
+            reasons.append(f"source changed ({fingerprint['source_path']})")
+        if previous.get("template") != fingerprint["template"]:
+            reasons.append(f"template changed ({fingerprint['template_path']})")
+        if previous.get("basepath") != fingerprint["basepath"]:
+            reasons.append(f"basepath changed ({previous.get('basepath')} -> {fingerprint['basepath']})")
+        if previous.get("version") != fingerprint["version"]:
+            reasons.append("generator version changed")
+        for asset_path, signature in sorted(previous.get("assets", {}).items()):
+            if self._asset_signature(asset_path) != signature:
+                reasons.append(f"asset changed ({asset_path})")
+        return reasons
+
+    def skip(self, dest_path):
+        """Keep the recorded entry of a page that is already up to date."""
+        key = self.key(dest_path)
+        self._seen[key] = self.entries[key]
+        self.skipped += 1
+
+    def record(self, dest_path, fingerprint, urls=()):
+        """
+        Store the fingerprint of a freshly generated page, together with the
+        static assets it references through the given URLs.
+        """
+        assets = {}
+        for url in urls:
+            asset_path = self.asset_path_for(url)
+            if asset_path is not None:
+                assets[asset_path] = self._asset_signature(asset_path)
+        entry = dict(fingerprint)
+        entry["assets"] = assets
+        self._seen[self.key(dest_path)] = entry
+        self.rebuilt += 1
+
+    def forget(self, dest_path):
+        """Drop an output whose source was deleted."""
+        self._seen.pop(self.key(dest_path), None)
+
+    def invalidate_template(self, template_path):
+        """Rehash the template next time it is used, after it was edited."""
+        self._template_hashes.pop(template_path, None)
+
+    def invalidate_asset(self, asset_path):
+        """Re-stat an asset next time it is checked, after it was edited."""
+        self._asset_signatures.pop(asset_path, None)
+
+    def scoped(self, dest_path, template_path):
+        """
+        Return a small manifest holding only what is needed to build one page,
+        cheap enough to send to a worker process.
+        """
+        child = BuildManifest(static_dir=self.static_dir, output_dir=self.output_dir)
+        child.explain = self.explain
+        key = self.key(dest_path)
+        if key in self.entries:
+            child.entries[key] = self.entries[key]
+            for asset_path in self.entries[key].get("assets", {}):
+                child._asset_signatures[asset_path] = self._asset_signature(asset_path)
+        child._template_hashes[template_path] = self._template_hash(template_path)
+        return child
+
+    def merge(self, child):
+        """Fold the results of a scoped manifest back into this one."""
+        self._seen.update(child._seen)
+        self._asset_signatures.update(child._asset_signatures)
+        self.rebuilt += child.rebuilt
+        self.skipped += child.skipped
+
+    def stale_outputs(self):
+        """
+        Output paths, under the current output_dir, of the pages recorded by
+        the previous build that were not built this time.
+        """
+        return [self.output_path(key) for key in sorted(set(self.entries) - set(self._seen))]
+
+    def save(self):
+        self.entries = dict(self._seen)
+        data = {
+            "format": MANIFEST_FORMAT,
+            "version": GENERATOR_VERSION,
+            "pages": self.entries,
+            "static": sorted(self.static_files),
+        }
+        with open(self.path, 'w') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+
+    def summary(self):
+        return f"Rebuilt {self.rebuilt} pages, skipped {self.skipped} unchanged pages"
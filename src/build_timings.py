@@ -0,0 +1,231 @@
+import json
+import os
+from time import perf_counter
+
+# Phases in pipeline order. Sub-phases of markdown_to_html_node are
+# indented in the report; "block_to_html_node" is whatever the parse took
+# beyond splitting, classifying and inline parsing. Pages are rendered
+# straight into the output file; CompiledTemplate.write_to times rendering
+# the content ("to_html") and substituting it into the template
+# ("template") over all the chunks it streams, and "write" is the rest of
+# producing the file (creating directories, writing, renaming it into
+# place). Blocks added to the block cache are rendered while parsing,
+# which also counts as "to_html".
+PHASES = [
+    ("static_copy", "static copy"),
+    ("read", "file read"),
+    ("markdown_to_blocks", "  markdown_to_blocks"),
+    ("block_to_block_type", "  block_to_block_type"),
+    ("inline_parsing", "  inline parsing (text_to_textnodes)"),
+    ("block_to_html_node", "  block_to_html_node"),
+    ("to_html", "to_html rendering"),
+    ("template", "template substitution"),
+    ("write", "write"),
+]
+
+PARSE_PHASES = ("markdown_to_blocks", "block_to_block_type", "inline_parsing")
+
+# Phases timed inside the streamed write of a page
+STREAM_PHASES = ("to_html", "template")
+
+# Event counters reported after the phases, as (counter, total) pairs with
+# the counter shown as a share of the total
+COUNTERS = [
+    ("inline_fast_path", "inline_texts", "inline texts without markup (fast path)"),
+]
+
+# Span names used in trace files where they differ from the phase names
+TRACE_NAMES = {
+    "static_copy": "copy_static",
+    "block_to_html_node": "parse (markdown_to_html_node)",
+    "to_html": "render (to_html)",
+}
+
+# Timings of the page currently being generated in this process, if any.
+# The parser modules check this so timing costs nothing when disabled.
+_current_page = None
+
+
+def current_page():
+    return _current_page
+
+
+def trace_event(name, start, end, **args):
+    """
+    Build a Chrome trace-event "complete" span.
+
+    Timestamps come from perf_counter(), which on Linux reads the system-wide
+    monotonic clock, so spans recorded by different worker processes line up
+    on one timeline. The worker's pid is used as the thread id so every
+    worker gets its own track.
+    """
+    worker = os.getpid()
+    return {
+        "name": name,
+        "ph": "X",
+        "ts": start * 1e6,
+        "dur": (end - start) * 1e6,
+        "pid": 1,
+        "tid": worker,
+        "args": dict(args, worker=worker),
+    }
+
+
+class PageTimings:
+    """Seconds spent in each phase while generating one page."""
+
+    def __init__(self, page, trace=False):
+        self.page = page
+        self.phases = {}
+        self.counts = {}
+        self.events = [] if trace else None
+        self.started = perf_counter()
+
+    def add(self, phase, seconds):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def span(self, phase, start, end):
+        self.add(phase, end - start)
+        if self.events is not None:
+            self.events.append(trace_event(TRACE_NAMES.get(phase, phase), start, end, page=self.page))
+
+    def count(self, counter, amount=1):
+        self.counts[counter] = self.counts.get(counter, 0) + amount
+
+    def total(self):
+        return sum(self.phases.values())
+
+
+class BuildTimings:
+    """
+    Collects per-phase timings for a whole build.
+
+    Build-level phases (the static copy) are added directly; page phases are
+    recorded on the PageTimings returned by start_page, which also becomes
+    the current_page() consulted by the parser while the page is generated.
+
+    With trace=True, the timed spans are also kept as Chrome trace events
+    (see write_trace) so the build can be inspected in Perfetto or
+    about:tracing.
+    """
+
+    def __init__(self, trace=False):
+        self.phases = {}
+        self.counts = {}
+        self.pages = []
+        self.events = [] if trace else None
+
+    def add(self, phase, seconds):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def span(self, phase, start, end):
+        self.add(phase, end - start)
+        if self.events is not None:
+            self.events.append(trace_event(TRACE_NAMES.get(phase, phase), start, end))
+
+    def count(self, counter, amount=1):
+        self.counts[counter] = self.counts.get(counter, 0) + amount
+
+    def start_page(self, page):
+        global _current_page
+        _current_page = PageTimings(page, self.events is not None)
+        return _current_page
+
+    def finish_page(self, page_timings):
+        global _current_page
+        _current_page = None
+        self.pages.append(page_timings)
+        for phase, seconds in page_timings.phases.items():
+            self.add(phase, seconds)
+        for counter, amount in page_timings.counts.items():
+            self.count(counter, amount)
+        if self.events is not None:
+            self.events.append(trace_event("generate_page", page_timings.started,
+                                           perf_counter(), page=page_timings.page))
+            self.events.extend(page_timings.events)
+            page_timings.events = None
+
+    def merge(self, other):
+        """Fold in timings collected by a worker process."""
+        self.pages.extend(other.pages)
+        for phase, seconds in other.phases.items():
+            self.add(phase, seconds)
+        for counter, amount in other.counts.items():
+            self.count(counter, amount)
+        if self.events is not None and other.events:
+            self.events.extend(other.events)
+
+    def write_trace(self, path):
+        """Write the recorded spans as a Chrome trace-event JSON file."""
+        main = os.getpid()
+        workers = sorted({event["tid"] for event in self.events})
+        metadata = [{
+            "name": "thread_name", "ph": "M", "pid": 1, "tid": worker,
+            "args": {"name": "main" if worker == main else f"worker {worker}"},
+        } for worker in workers]
+        metadata.append({"name": "process_name", "ph": "M", "pid": 1, "tid": main,
+                         "args": {"name": "build"}})
+        with open(path, 'w') as f:
+            json.dump({"traceEvents": metadata + self.events, "displayTimeUnit": "ms"}, f)
+
+    def total(self):
+        return sum(self.phases.values())
+
+    def slowest(self, count):
+        return sorted(self.pages, key=lambda page: page.total(), reverse=True)[:count]
+
+    def report(self, slowest=10):
+        """Format the totals and the slowest pages as a text table."""
+        total = self.total() or 1.0
+        lines = [f"{'Phase':<40}{'Seconds':>10}{'Share':>8}"]
+        for phase, label in PHASES:
+            seconds = self.phases.get(phase, 0.0)
+            lines.append(f"{label:<40}{seconds:>10.4f}{seconds / total:>8.1%}")
+        lines.append(f"{'total':<40}{self.total():>10.4f}")
+
+        for counter, total_counter, label in COUNTERS:
+            if total_counter in self.counts:
+                amount = self.counts.get(counter, 0)
+                of = self.counts[total_counter]
+                lines.append(f"{label:<40}{f'{amount}/{of}':>10}{amount / of:>8.1%}")
+
+        if self.pages:
+            lines.append("")
+            lines.append(f"Slowest {min(slowest, len(self.pages))} of {len(self.pages)} pages:")
+            for page_timings in self.slowest(slowest):
+                top = sorted(page_timings.phases.items(), key=lambda item: item[1], reverse=True)[:3]
+                breakdown = ", ".join(f"{phase} {seconds * 1000:.2f}ms" for phase, seconds in top)
+                lines.append(f"  {page_timings.total() * 1000:9.2f}ms  {page_timings.page}  ({breakdown})")
+        return "\n".join(lines)
+
+    def to_dict(self, slowest=10):
+        return {
+            "total": self.total(),
+            "phases": {phase: self.phases.get(phase, 0.0) for phase, _ in PHASES},
+            "counts": dict(self.counts),
+            "pages": {page.page: dict(page.phases, total=page.total()) for page in self.pages},
+            "slowest": [page.page for page in self.slowest(slowest)],
+        }
+
+    def write_json(self, path, slowest=10):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(slowest), f, indent=2)
+
+
+class timed:
+    """
+    Context manager adding the time spent in its body to a timings object
+    (a BuildTimings or PageTimings, or None to time nothing).
+    """
+
+    def __init__(self, timings, phase):
+        self.timings = timings
+        self.phase = phase
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.timings is not None:
+            self.timings.span(self.phase, self.start, perf_counter())
@@ -0,0 +1,99 @@
+import re
+from time import perf_counter
+
+# Placeholders recognised in template.html
+PLACEHOLDER_PATTERN = re.compile(r"\{\{ (Title|Content) \}\}")
+
+
+def rewrite_root_urls(html, basepath):
+    """
+    Point root-relative href/src attributes at the site's basepath.
+
+    With the default basepath "/" the rewrite is a no-op, so the string is
+    returned without scanning it.
+    """
+    if basepath == "/":
+        return html
+    html = html.replace('href="/', f'href="{basepath}')
+    return html.replace('src="/', f'src="{basepath}')
+
+
+class CompiledTemplate:
+    """
+    A page template split once into static segments and placeholder slots.
+
+    The template is read and the basepath rewrite is applied to its static
+    text a single time per build. Writing a page (write_to) then only
+    rewrites the values being substituted and writes the pieces out in
+    turn, instead of running several full-document replace() passes per
+    page.
+
+    Example:
+        template.html: "<title>{{ Title }}</title>{{ Content }}"
+        parts: ["<title>", "Title", "</title>", "Content", ""]
+        (even indices are static text, odd indices are slot names)
+    """
+
+    def __init__(self, source, basepath="/"):
+        self.basepath = basepath
+        self.parts = PLACEHOLDER_PATTERN.split(source)
+        for i in range(0, len(self.parts), 2):
+            self.parts[i] = rewrite_root_urls(self.parts[i], basepath)
+
+    @classmethod
+    def from_file(cls, template_path, basepath="/"):
+        with open(template_path, 'r') as f:
+            return cls(f.read(), basepath)
+
+    def write_to(self, file, title, content_node, timings=None):
+        """
+        Stream the page to a text file: the static template text, the
+        title, and the content node's HTML chunk by chunk, without building
+        the rendered document or the page as a whole string.
+        
+        Chunks are whole tags or leaves, so an attribute is never split
+        between two chunks and the basepath rewrite can be applied to each
+        chunk on its own.
+        
+        With timings (a PageTimings), the time spent producing the chunks
+        is recorded as "to_html" and rewriting them as "template", as one
+        span each for the page.
+        """
+        if timings is not None:
+            self._write_to_timed(file, title, content_node, timings)
+            return
+        basepath = self.basepath
+        for i, part in enumerate(self.parts):
+            if i % 2 == 0:
+                file.write(part)
+            elif part == "Title":
+                file.write(rewrite_root_urls(title, basepath))
+            elif basepath == "/":
+                content_node.write_to(file)
+            else:
+                file.writelines(rewrite_root_urls(chunk, basepath)
+                                for chunk in content_node.to_html_iter())
+
+    def _write_to_timed(self, file, title, content_node, timings):
+        # Chunk times are added up and recorded once per phase for the
+        # page, so a trace gets two spans per page rather than per block
+        basepath = self.basepath
+        began = perf_counter()
+        rendering = substituting = 0.0
+        for i, part in enumerate(self.parts):
+            if i % 2 == 0:
+                file.write(part)
+                continue
+            chunks = [title] if part == "Title" else content_node.to_html_iter()
+            start = perf_counter()
+            for chunk in chunks:
+                rendered = perf_counter()
+                chunk = rewrite_root_urls(chunk, basepath)
+                substituted = perf_counter()
+                rendering += rendered - start
+                substituting += substituted - rendered
+                file.write(chunk)
+                start = perf_counter()
+        # The spans are laid end to end from the start of the write
+        timings.span("to_html", began, began + rendering)
+        timings.span("template", began + rendering, began + rendering + substituting)
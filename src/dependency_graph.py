@@ -0,0 +1,56 @@
+class DependencyGraph:
+    """
+    Map between generated pages and the files they were built from.
+
+    The graph is built from the entries a BuildManifest recorded for the
+    last build: each page's markdown source, template and referenced
+    static assets. It is kept in both directions so that, given a set of
+    changed files, the pages that have gone stale can be found without
+    visiting every page. The watcher uses it to find the pages referencing
+    a changed asset; basepath and generator version changes are caught by
+    the manifest fingerprint instead.
+    """
+
+    def __init__(self):
+        self.inputs = {}
+        self.dependents = {}
+
+    @classmethod
+    def from_manifest_entries(cls, entries):
+        """Build the graph from the per-page entries of a BuildManifest."""
+        graph = cls()
+        for output, entry in entries.items():
+            inputs = []
+            if entry.get("source_path"):
+                inputs.append(entry["source_path"])
+            if entry.get("template_path"):
+                inputs.append(entry["template_path"])
+            inputs.extend(entry.get("assets", {}))
+            graph.add(output, inputs)
+        return graph
+
+    def add(self, output, inputs):
+        self.remove(output)
+        self.inputs[output] = set(inputs)
+        for input_path in self.inputs[output]:
+            self.dependents.setdefault(input_path, set()).add(output)
+
+    def remove(self, output):
+        for input_path in self.inputs.pop(output, ()):
+            outputs = self.dependents[input_path]
+            outputs.discard(output)
+            if not outputs:
+                del self.dependents[input_path]
+
+    def stale_outputs(self, changed_inputs):
+        """
+        Find the outputs affected by a set of changed inputs.
+
+        Returns:
+            dict: output -> sorted list of the changed inputs it depends on
+        """
+        stale = {}
+        for input_path in changed_inputs:
+            for output in self.dependents.get(input_path, ()):
+                stale.setdefault(output, []).append(input_path)
+        return {output: sorted(reasons) for output, reasons in sorted(stale.items())}
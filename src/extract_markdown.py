@@ -1,25 +1,114 @@
 import re
-from textnode import TextNode, TextType
+from collections import namedtuple
+
+
+# A link or image found in a text: start/end are the offsets of the whole
+# markdown syntax, label is the alt/anchor text and url the target
+InlineMatch = namedtuple("InlineMatch", ["start", "end", "label", "url"])
+
+# The only characters the bracket and paren tables are built from
+BRACKETS_AND_PARENS = re.compile(r"[\[\]()]")
+
+
+class LinkScanner:
+    """
+    Linear-time finder for markdown links [anchor](url) and images ![alt](url).
+
+    One pass over just the brackets and parentheses of the text pairs every [
+    with its balanced ] and every ( with its balanced ), using a stack for
+    each; text without a [ cannot hold a link or image and skips the pass.
+    After that, deciding whether a link or image starts at a given offset is
+    a couple of table lookups, so finding all links and images costs O(n)
+    even on adversarial input such as thousands of unclosed brackets.
+
+    Because brackets and parentheses are matched with nesting, anchor text
+    may contain balanced brackets ("[see [1]](url)") and URLs may contain
+    balanced parentheses ("(https://en.wikipedia.org/wiki/Foo_(bar))").
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.closing = {}
+
+        if "[" not in text:
+            return
+
+        brackets = []
+        parens = []
+        for match in BRACKETS_AND_PARENS.finditer(text):
+            index = match.start()
+            char = match.group()
+            if char == "[":
+                brackets.append(index)
+            elif char == "]":
+                if brackets:
+                    self.closing[brackets.pop()] = index
+            elif char == "(":
+                parens.append(index)
+            elif char == ")":
+                if parens:
+                    self.closing[parens.pop()] = index
+
+    def _match_brackets(self, start, open_bracket, end):
+        # [label] must be followed directly by (url), all before end
+        close_bracket = self.closing.get(open_bracket)
+        if close_bracket is None or close_bracket + 1 >= end:
+            return None
+        open_paren = close_bracket + 1
+        if self.text[open_paren] != "(":
+            return None
+        close_paren = self.closing.get(open_paren)
+        if close_paren is None or close_paren >= end:
+            return None
+        return InlineMatch(start, close_paren + 1,
+                           self.text[open_bracket + 1:close_bracket],
+                           self.text[open_paren + 1:close_paren])
+
+    def image_at(self, position, end=None):
+        """Return the image starting exactly at position, or None."""
+        if not self.text.startswith("![", position):
+            return None
+        return self._match_brackets(position, position + 1, len(self.text) if end is None else end)
+
+    def link_at(self, position, end=None):
+        """Return the link starting exactly at position, or None."""
+        if self.text[position:position + 1] != "[":
+            return None
+        # A [ directly after ! belongs to image syntax
+        if position > 0 and self.text[position - 1] == "!":
+            return None
+        return self._match_brackets(position, position, len(self.text) if end is None else end)
+
+    def images(self, start=0, end=None):
+        """Yield non-overlapping images, leftmost first."""
+        end = len(self.text) if end is None else end
+        position = self.text.find("![", start, end)
+        while position != -1:
+            image = self.image_at(position, end)
+            if image is not None:
+                yield image
+                position = self.text.find("![", image.end, end)
+            else:
+                position = self.text.find("![", position + 1, end)
+
+    def links(self, start=0, end=None):
+        """Yield non-overlapping links, leftmost first."""
+        end = len(self.text) if end is None else end
+        position = self.text.find("[", start, end)
+        while position != -1:
+            link = self.link_at(position, end)
+            if link is not None:
+                yield link
+                position = self.text.find("[", link.end, end)
+            else:
+                position = self.text.find("[", position + 1, end)
 
 
 def extract_markdown_images(text):
-    # Regex pattern for markdown images: ![alt text](url)
-    pattern = r"!\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    
-    # re.findall returns list of tuples when regex has multiple capture groups
-    # Each tuple contains (alt_text, url)
-    matches = re.findall(pattern, text)
-    
-    return matches
+    # Returns a list of (alt_text, url) tuples
+    return [(image.label, image.url) for image in LinkScanner(text).images()]
 
 
 def extract_markdown_links(text):
-    # Regex pattern for markdown links: [anchor text](url)
-    # (?<!!): negative lookbehind to exclude images (which start with !)
-    pattern = r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    
-    # re.findall returns list of tuples when regex has multiple capture groups
-    # Each tuple contains (anchor_text, url)
-    matches = re.findall(pattern, text)
-    
-    return matches
\ No newline at end of file
+    # Returns a list of (anchor_text, url) tuples
+    return [(link.label, link.url) for link in LinkScanner(text).links()]
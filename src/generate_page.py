@@ -1,50 +1,197 @@
+import contextlib
+import io
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from markdown_to_html_node import markdown_to_html_node
-from extract_title import extract_title
+from block_scanner import PageMetadata
+from compiled_template import CompiledTemplate
+from build_timings import BuildTimings, PARSE_PHASES, STREAM_PHASES, timed
+from block_cache import collect_root_urls
+from parse_warnings import ParseWarnings
 
-def generate_page(from_path, template_path, dest_path, basepath="/"):
-    print(f"Generating page from {from_path} to {dest_path} using {template_path}")
+def stream_file_atomic(path, write):
+    """
+    Call write(file) to stream the contents of path into a temporary file,
+    then rename it over path. Readers never see a half-written page, and a
+    hardlinked previous version of the file is replaced rather than
+    modified.
+    """
+    temp_path = f"{path}.tmp{os.getpid()}"
+    try:
+        with open(temp_path, 'w') as f:
+            write(f)
+    except BaseException:
+        # open() itself may have failed; either way the original error wins
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(temp_path)
+        raise
+    os.replace(temp_path, path)
+
+def generate_page(from_path, template_path, dest_path, basepath="/", manifest=None, template=None, timings=None, block_cache=None):
+    page_timings = timings.start_page(dest_path) if timings is not None else None
+    try:
+        return _generate_page(from_path, template_path, dest_path, basepath,
+                              manifest, template, page_timings, block_cache)
+    finally:
+        if page_timings is not None:
+            timings.finish_page(page_timings)
+
+def _generate_page(from_path, template_path, dest_path, basepath, manifest, template, page_timings, block_cache):
+    with timed(page_timings, "read"):
+        with open(from_path, 'r') as f:
+            markdown_content = f.read()
     
-    with open(from_path, 'r') as f:
-        markdown_content = f.read()
+    fingerprint = None
+    if manifest is not None:
+        fingerprint = manifest.fingerprint(from_path, markdown_content, template_path, basepath)
+        reasons = manifest.explain_rebuild(dest_path, fingerprint)
+        if not reasons:
+            print(f"Skipping unchanged page {dest_path}")
+            manifest.skip(dest_path)
+            return False
+        if manifest.explain:
+            print(f"Rebuilding {dest_path}: {'; '.join(reasons)}")
     
-    with open(template_path, 'r') as f:
-        template_content = f.read()
+    print(f"Generating page from {from_path} to {dest_path} using {template_path}")
     
-    html_node = markdown_to_html_node(markdown_content)
-    html_content = html_node.to_html()
+    if template is None:
+        template = CompiledTemplate.from_file(template_path, basepath)
     
-    title = extract_title(markdown_content)
+    # The title is picked up by the same scan that parses the page
+    metadata = PageMetadata()
+    nested = _nested_seconds(page_timings)
+    with timed(page_timings, "block_to_html_node"), ParseWarnings(from_path) as warnings:
+        html_node = markdown_to_html_node(markdown_content, block_cache, metadata)
+    for warning in warnings:
+        print(f"Warning: {warning}")
+    if page_timings is not None:
+        # The parse total includes its timed sub-phases (and the rendering
+        # of blocks added to the block cache); keep only the rest
+        page_timings.add("block_to_html_node", nested - _nested_seconds(page_timings))
     
-    full_html = template_content.replace("{{ Title }}", title).replace("{{ Content }}", html_content)
+    title = metadata.require_title()
     
-    full_html = full_html.replace('href="/', f'href="{basepath}')
-    full_html = full_html.replace('src="/', f'src="{basepath}')
+    # Rendering is streamed straight into the output file: the template's
+    # head, the content block by block, then its tail
+    nested = _nested_seconds(page_timings)
+    with timed(page_timings, "write"):
+        dest_dir = os.path.dirname(dest_path)
+        if dest_dir:
+            os.makedirs(dest_dir, exist_ok=True)
+        stream_file_atomic(dest_path, lambda f: template.write_to(f, title, html_node, page_timings))
+    if page_timings is not None:
+        # The write total includes the rendering and substitution timed
+        # inside write_to; keep only the rest
+        page_timings.add("write", nested - _nested_seconds(page_timings))
     
-    dest_dir = os.path.dirname(dest_path)
-    if dest_dir and not os.path.exists(dest_dir):
-        os.makedirs(dest_dir)
+    if manifest is not None:
+        manifest.record(dest_path, fingerprint, collect_root_urls(html_node))
     
-    with open(dest_path, 'w') as f:
-        f.write(full_html)
+    return True
+
+def _nested_seconds(page_timings):
+    # Time recorded so far in the phases that are timed inside the parse
+    # and write phases
+    if page_timings is None:
+        return 0.0
+    return sum(page_timings.phases.get(phase, 0.0) for phase in PARSE_PHASES + STREAM_PHASES)
 
-def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath="/"):
+def dest_path_for(src_path, dir_path_content, dest_dir_path):
+    """Map a markdown file under dir_path_content to its HTML output path."""
+    relative_path = os.path.relpath(src_path, dir_path_content)
+    return os.path.join(dest_dir_path, str(Path(relative_path).with_suffix(".html")))
+
+def collect_pages(dir_path_content, dest_dir_path):
+    """
+    Walk the content directory once and pair every markdown file with the
+    HTML path it should be generated to.
+    
+    Returns:
+        list: (src_path, dest_path) tuples in directory listing order
+    """
+    pages = []
     for item in os.listdir(dir_path_content):
         src_path = os.path.join(dir_path_content, item)
         
         if os.path.isfile(src_path):
             if item.endswith('.md'):
-                relative_path = os.path.relpath(src_path, dir_path_content)
-                relative_dir = os.path.dirname(relative_path)
-                filename = Path(item).stem
-                
-                if relative_dir:
-                    dest_path = os.path.join(dest_dir_path, relative_dir, f"{filename}.html")
-                else:
-                    dest_path = os.path.join(dest_dir_path, f"{filename}.html")
-                
-                generate_page(src_path, template_path, dest_path, basepath)
+                pages.append((src_path, dest_path_for(src_path, dir_path_content, dest_dir_path)))
         else:
             dest_subdir = os.path.join(dest_dir_path, item)
-            generate_pages_recursive(src_path, template_path, dest_subdir, basepath)
\ No newline at end of file
+            pages.extend(collect_pages(src_path, dest_subdir))
+    return pages
+
+# Each worker process's copy of the build's block cache, set up once per
+# worker by _init_worker rather than pickled along with every page
+_worker_block_cache = None
+
+def _init_worker(block_cache):
+    global _worker_block_cache
+    _worker_block_cache = block_cache
+
+def _generate_page_in_worker(from_path, template_path, dest_path, basepath, manifest, template, timed_build):
+    # Capture the page's log lines so the parent can print them in one piece
+    log = io.StringIO()
+    timings = BuildTimings(trace=(timed_build == "trace")) if timed_build else None
+    with contextlib.redirect_stdout(log):
+        generate_page(from_path, template_path, dest_path, basepath, manifest, template,
+                      timings, _worker_block_cache)
+    # Send back the blocks this page added so the parent's cache learns them
+    cached = _worker_block_cache.take_new() if _worker_block_cache is not None else None
+    return log.getvalue(), manifest, timings, cached
+
+def _timing_mode(timings):
+    if timings is None:
+        return None
+    return "trace" if timings.events is not None else "timings"
+
+def generate_pages_parallel(pages, template_path, basepath="/", manifest=None, jobs=None, template=None, timings=None, block_cache=None):
+    """
+    Generate pages on a pool of worker processes.
+    
+    Pages are submitted largest-first so a single huge page does not end up
+    as the straggler of the build. Each worker gets a manifest scoped to its
+    own page, and its log output is printed by the parent once the page is
+    done, so lines from different pages never interleave.
+    
+    Each worker starts from a copy of block_cache; the blocks it renders are
+    merged back into block_cache as pages complete.
+    """
+    pages = sorted(pages, key=lambda page: os.path.getsize(page[0]), reverse=True)
+    
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(block_cache,)) as executor:
+        futures = []
+        for src_path, dest_path in pages:
+            page_manifest = None
+            if manifest is not None:
+                page_manifest = manifest.scoped(dest_path, template_path)
+            futures.append(executor.submit(_generate_page_in_worker, src_path,
+                                           template_path, dest_path, basepath,
+                                           page_manifest, template,
+                                           _timing_mode(timings)))
+        
+        for future in as_completed(futures):
+            log, page_manifest, page_timings, cached = future.result()
+            sys.stdout.write(log)
+            if manifest is not None:
+                manifest.merge(page_manifest)
+            if timings is not None:
+                timings.merge(page_timings)
+            if block_cache is not None:
+                block_cache.merge(cached)
+
+def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath="/", manifest=None, jobs=1, timings=None, block_cache=None):
+    pages = collect_pages(dir_path_content, dest_dir_path)
+    template = CompiledTemplate.from_file(template_path, basepath)
+    
+    if jobs != 1 and len(pages) > 1:
+        generate_pages_parallel(pages, template_path, basepath, manifest, jobs or None, template,
+                                timings, block_cache)
+        return
+    
+    for src_path, dest_path in pages:
+        generate_page(src_path, template_path, dest_path, basepath, manifest, template, timings,
+                      block_cache)
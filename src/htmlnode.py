@@ -1,5 +1,9 @@
 class HTMLNode:
 
+    # Slots instead of a per-instance __dict__ keep nodes small; subclasses
+    # declare their own (usually empty) __slots__ to stay dict-free
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag=None, value=None, children=None, props=None):
         self.tag = tag
         self.value = value
@@ -9,6 +13,14 @@ class HTMLNode:
     def to_html(self):
         raise NotImplementedError("to_html method must be implemented by subclasses")
 
+    def to_html_iter(self):
+        """Yield the node's HTML in chunks that join up to to_html()."""
+        yield self.to_html()
+
+    def write_to(self, file):
+        """Write the node's HTML to a text file, chunk by chunk."""
+        file.writelines(self.to_html_iter())
+
     def props_to_html(self):
         if self.props is None:
             return ""
@@ -1,35 +1,173 @@
+import argparse
 import os
 import shutil
 import sys
+from time import perf_counter
 from generate_page import generate_pages_recursive
+from build_manifest import BuildManifest
+from static_sync import sync_static, remove_empty_dirs
+from asset_materializer import AssetMaterializer, STRATEGIES
+from watcher import Watcher
+from staged_output import StagedOutput
+from build_timings import BuildTimings, timed, trace_event
+from block_cache import BlockCache
 
-def copy_static(src_dir, dest_dir):
-    if os.path.exists(dest_dir):
+MANIFEST_PATH = ".build_manifest.json"
+BUILDS_DIR = ".docs-builds"
+
+def remove_stale_pages(manifest, dest_dir):
+    for dest_path in manifest.stale_outputs():
+        # Only ever delete inside the directory being built (the staging
+        # directory for --atomic), never in the live site
+        if os.path.relpath(dest_path, dest_dir).startswith(os.pardir):
+            continue
+        if os.path.exists(dest_path):
+            print(f"Removing page with deleted source: {dest_path}")
+            os.remove(dest_path)
+            remove_empty_dirs(os.path.dirname(dest_path), dest_dir)
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Build the static site into docs/")
+    parser.add_argument("basepath", nargs="?", default="/",
+                        help="URL prefix the site is served from (default: /)")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="number of worker processes for page generation "
+                             "(default: 1)")
+    parser.add_argument("--clean", action="store_true",
+                        help="delete docs/ and rebuild everything from scratch")
+    parser.add_argument("--checksum", action="store_true",
+                        help="compare static files by content hash instead of "
+                             "size and modification time")
+    parser.add_argument("--asset-strategy", default="auto",
+                        choices=["auto"] + STRATEGIES,
+                        help="how static files are placed in docs/; unsupported "
+                             "strategies fall back to the next cheapest "
+                             "(default: auto, i.e. reflink)")
+    parser.add_argument("--atomic", action="store_true",
+                        help="build into a staging directory and publish it by "
+                             "atomically swapping the docs symlink")
+    parser.add_argument("--keep-builds", type=int, default=1,
+                        help="previous builds to keep for --rollback when using "
+                             "--atomic (default: 1)")
+    parser.add_argument("--rollback", action="store_true",
+                        help="make the previous --atomic build live again and exit")
+    parser.add_argument("--explain", action="store_true",
+                        help="print why each page is being rebuilt")
+    parser.add_argument("--timings", action="store_true",
+                        help="print how long each build phase took, in total "
+                             "and for the slowest pages")
+    parser.add_argument("--timings-json", metavar="PATH",
+                        help="also write the timings as JSON to PATH")
+    parser.add_argument("--slowest", type=int, default=10,
+                        help="number of slowest pages to report (default: 10)")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="write a Chrome trace-event JSON file of the build, "
+                             "viewable in Perfetto or about:tracing")
+    parser.add_argument("--block-cache-size", type=int, default=0,
+                        help="rendered blocks to keep for reuse by identical blocks "
+                             "on other pages; pays off when pages share many blocks "
+                             "(default: 0, i.e. no cache)")
+    parser.add_argument("--block-cache-file", metavar="PATH",
+                        help="load the block cache from PATH and save it back after "
+                             "the build, so it survives between builds")
+    parser.add_argument("--watch", action="store_true",
+                        help="after building, keep running and rebuild only the "
+                             "outputs affected by each change")
+    parser.add_argument("--watch-interval", type=float, default=0.5,
+                        help="seconds between checks for changes in watch mode "
+                             "(default: 0.5)")
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.atomic and args.watch:
+        parser.error("--watch updates docs/ in place and cannot be combined with --atomic")
+    return args
+
+def build(args):
+    basepath = args.basepath
+    
+    staged = None
+    dest_dir = "docs"
+    if args.atomic:
+        staged = StagedOutput("docs", BUILDS_DIR, args.keep_builds)
+        dest_dir = staged.prepare()
+    
+    # Pages are recorded relative to dest_dir, so a staged build recognises
+    # the pages of a build that went straight into docs/ and vice versa
+    manifest = BuildManifest(MANIFEST_PATH, "static", dest_dir)
+    manifest.explain = args.explain
+    
+    if args.clean and staged is None and os.path.islink(dest_dir):
+        # docs is the symlink left by earlier --atomic builds
+        print(f"Removing {dest_dir} and the staged builds in {BUILDS_DIR}")
+        StagedOutput(dest_dir, BUILDS_DIR).clear()
+    elif args.clean and os.path.exists(dest_dir):
         print(f"Removing existing destination directory: {dest_dir}")
         shutil.rmtree(dest_dir)
     
-    print(f"Creating destination directory: {dest_dir}")
-    os.mkdir(dest_dir)
-    
-    for item in os.listdir(src_dir):
-        src_path = os.path.join(src_dir, item)
-        dest_path = os.path.join(dest_dir, item)
-        
-        if os.path.isfile(src_path):
-            print(f"Copying file: {src_path} -> {dest_path}")
-            shutil.copy(src_path, dest_path)
-        else:
-            print(f"Copying directory: {src_path} -> {dest_path}")
-            copy_static(src_path, dest_path)
+    timings = None
+    if args.timings or args.timings_json or args.trace:
+        timings = BuildTimings(trace=bool(args.trace))
+    
+    materializer = AssetMaterializer(args.asset_strategy)
+    with timed(timings, "static_copy"):
+        result = sync_static("static", dest_dir, manifest.static_files, args.checksum, materializer)
+    manifest.static_files = sorted(result.files)
+    print(result.summary())
+    print(materializer.summary())
+    
+    block_cache = None
+    if args.block_cache_size > 0:
+        block_cache = BlockCache(args.block_cache_size, args.block_cache_file)
+    
+    generate_pages_recursive("content", "template.html", dest_dir, basepath, manifest, args.jobs,
+                             timings, block_cache)
+    remove_stale_pages(manifest, dest_dir)
+    if block_cache is not None:
+        print(block_cache.summary())
+        if block_cache.path is not None:
+            block_cache.save()
+    
+    if staged is not None:
+        print(f"Published {staged.publish()} as docs")
+    
+    # Saved last: the manifest must only ever describe a build that is
+    # live, or the next build would skip pages it never published
+    manifest.save()
+    print(manifest.summary())
+    
+    if timings is not None:
+        if args.timings:
+            print(timings.report(args.slowest))
+        if args.timings_json:
+            timings.write_json(args.timings_json, args.slowest)
+    
+    return manifest, materializer, timings, block_cache
 
 def main():
-    basepath = "/"
-    if len(sys.argv) > 1:
-        basepath = sys.argv[1]
+    args = parse_args(sys.argv[1:])
+    
+    if args.rollback:
+        previous = StagedOutput("docs", BUILDS_DIR, args.keep_builds).rollback()
+        print(f"Rolled back docs to {previous}")
+        # The manifest describes the build that was just replaced, so the
+        # next build has to start from scratch
+        if os.path.exists(MANIFEST_PATH):
+            os.remove(MANIFEST_PATH)
+        return
+    
+    start = perf_counter()
+    manifest, materializer, timings, block_cache = build(args)
     
-    copy_static("static", "docs")
+    if args.trace:
+        timings.events.append(trace_event("main", start, perf_counter()))
+        timings.write_trace(args.trace)
+        print(f"Wrote build trace to {args.trace}")
     
-    generate_pages_recursive("content", "template.html", "docs", basepath)
+    if args.watch:
+        watcher = Watcher("content", "static", "template.html", "docs", args.basepath,
+                          manifest, materializer, args.watch_interval, block_cache)
+        watcher.run()
 
 if __name__ == "__main__":
    main()
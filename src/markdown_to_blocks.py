@@ -1,3 +1,6 @@
+from block_scanner import iter_blocks
+
+
 def markdown_to_blocks(markdown):
     """
     Split a markdown document into separate block-level elements.
@@ -21,29 +24,15 @@ def markdown_to_blocks(markdown):
         - Any other block-level content
         
     Processing Steps:
-        1. Split on double newlines (\n\n) to separate blocks
-        2. Strip whitespace from each block
-        3. Remove empty blocks (caused by excessive newlines)
+        1. Cut the document at runs of blank lines (see block_scanner.iter_blocks)
+        2. Join the pieces of a ``` fence that contains blank lines
+        3. Strip whitespace from each block and drop empty ones
         4. Return clean list of block strings
         
     Example:
         Input: "# Heading\n\nParagraph text\n\n- List item"
         Output: ["# Heading", "Paragraph text", "- List item"]
     """
-    # Step 1: Split the markdown on double newlines
-    # Double newlines (\n\n) are the standard way to separate blocks in markdown
-    raw_blocks = markdown.split("\n\n")
-    
-    # Step 2: Clean up each block and filter out empty ones
-    blocks = []
-    for block in raw_blocks:
-        # Strip leading and trailing whitespace from each block
-        # This removes extra spaces, tabs, and single newlines
-        cleaned_block = block.strip()
-        
-        # Only add non-empty blocks to the result
-        # This handles cases where there are excessive newlines creating empty blocks
-        if cleaned_block:
-            blocks.append(cleaned_block)
-    
-    return blocks
\ No newline at end of file
+    # The scanner keeps blank lines inside fenced code in their block,
+    # which a plain split on "\n\n" would not
+    return list(iter_blocks(markdown))
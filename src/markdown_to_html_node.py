@@ -1,14 +1,19 @@
-from markdown_to_blocks import markdown_to_blocks
-from block_to_block_type import BlockType, block_to_block_type
-from text_to_textnodes import text_to_textnodes
-from text_node_to_html_node import text_node_to_html_node
+from block_scanner import iter_numbered_blocks
+from block_to_block_type import BlockType, classify_block
+from text_to_textnodes import SPECIAL_CHARACTERS, text_to_textnodes
+from text_node_to_html_node import text_nodes_to_html
 from htmlnode import HTMLNode
 from parentnode import ParentNode
 from leafnode import LeafNode
+from rawhtmlnode import RawHTMLNode
 from textnode import TextNode, TextType
+from build_timings import current_page
+from build_manifest import hash_text
+from parse_warnings import ParseWarnings, current_warnings, warn
+from time import perf_counter
 
 
-def markdown_to_html_node(markdown):
+def markdown_to_html_node(markdown, block_cache=None, metadata=None):
     """
     Convert a full markdown document to a single HTML node tree.
     
@@ -16,66 +21,97 @@ def markdown_to_html_node(markdown):
     It processes both block-level structure and inline formatting.
     
     Args:
-        markdown (str): Complete markdown document string
+        markdown (str or file): Complete markdown document string, or a text
+            file object to read it from line by line
+        block_cache (BlockCache): Optional cache of rendered blocks; blocks
+            found in it are neither classified nor converted again
+        metadata (PageMetadata): Optional object to fill in with the title
+            and other facts found while scanning, e.g. for generate_page
         
     Returns:
         ParentNode: A div element containing all the converted blocks as children
         
     Process:
-        1. Split markdown into blocks
+        1. Scan the markdown into typed blocks, one at a time
         2. For each block:
-           a. Determine block type
-           b. Create appropriate HTML structure
-           c. Process inline content within the block
+           a. Create appropriate HTML structure
+           b. Process inline content within the block
         3. Wrap all blocks in a parent div element
         
     Example:
         Input: "# Title\n\nParagraph with **bold**"
         Output: ParentNode("div", [
             ParentNode("h1", [LeafNode(None, "Title")]),
-            ParentNode("p", [LeafNode(None, "Paragraph with "), LeafNode("b", "bold")])
+            ParentNode("p", [RawHTMLNode("Paragraph with <b>bold</b>", [])])
         ])
     """
-    # Step 1: Split the markdown document into individual blocks
-    blocks = markdown_to_blocks(markdown)
+    # Warnings about this document, if anyone is collecting them
+    warnings = current_warnings()
     
-    # Step 2: Convert each block to an HTMLNode
+    # Step 1: Scan the document block by block. A file object is read
+    # lazily, so only the current block's text is held alongside the
+    # finished nodes
     block_nodes = []
-    for block in blocks:
-        # Determine what type of block this is
-        block_type = block_to_block_type(block)
+    for line, block in iter_numbered_blocks(markdown, metadata):
+        if warnings is not None:
+            warnings.line = line
         
-        # Convert the block to an HTMLNode based on its type
-        html_node = block_to_html_node(block, block_type)
+        if block_cache is None:
+            # Step 2: Convert the block to an HTMLNode based on its type
+            block_nodes.append(block_to_html_node(_timed_classify(block)))
+            continue
+        
+        # Blocks seen before (on any page) come straight from the cache
+        key = hash_text(block)
+        html_node = block_cache.get(key)
+        if html_node is None:
+            # Keep the block's warnings with it, so they can be reported
+            # again for every later page the block is found on
+            with ParseWarnings() as block_warnings:
+                html_node = block_to_html_node(_timed_classify(block))
+            messages = [warning.message for warning in block_warnings]
+            html_node = block_cache.put(key, html_node, messages)
+        for message in html_node.warnings:
+            warn(message)
         block_nodes.append(html_node)
     
     # Step 3: Wrap all blocks in a parent div element
     return ParentNode("div", block_nodes)
 
 
-def block_to_html_node(block, block_type):
+def _timed_classify(block):
+    timings = current_page()
+    start = perf_counter() if timings else 0
+    classified = classify_block(block)
+    if timings:
+        timings.add("block_to_block_type", perf_counter() - start)
+    return classified
+
+
+def block_to_html_node(classified):
     """
-    Convert a single markdown block to an HTMLNode based on its type.
+    Convert a single classified markdown block to an HTMLNode based on its type.
     
     Args:
-        block (str): The raw markdown block text
-        block_type (BlockType): The type of block this represents
+        classified (ClassifiedBlock): The block's type and prefix-stripped
+            lines, as returned by classify_block
         
     Returns:
         HTMLNode: The HTML representation of this block
     """
+    block_type = classified.block_type
     if block_type == BlockType.PARAGRAPH:
-        return paragraph_to_html_node(block)
+        return paragraph_to_html_node(classified)
     elif block_type == BlockType.HEADING:
-        return heading_to_html_node(block)
+        return heading_to_html_node(classified)
     elif block_type == BlockType.CODE:
-        return code_to_html_node(block)
+        return code_to_html_node(classified)
     elif block_type == BlockType.QUOTE:
-        return quote_to_html_node(block)
+        return quote_to_html_node(classified)
     elif block_type == BlockType.UNORDERED_LIST:
-        return unordered_list_to_html_node(block)
+        return unordered_list_to_html_node(classified)
     elif block_type == BlockType.ORDERED_LIST:
-        return ordered_list_to_html_node(block)
+        return ordered_list_to_html_node(classified)
     else:
         raise ValueError(f"Unsupported block type: {block_type}")
 
@@ -87,25 +123,42 @@ def text_to_children(text):
     This is the bridge between block-level and inline processing.
     It handles all inline markdown within a block.
     
+    The inline nodes are rendered straight to HTML with text_nodes_to_html,
+    so the result is a single RawHTMLNode rather than one LeafNode per span.
+    Use text_to_textnodes and text_node_to_html_node for the per-span tree.
+    
     Args:
         text (str): Raw markdown text containing inline formatting
         
     Returns:
         list: List of HTMLNode objects representing the inline content
     """
+    timings = current_page()
+    start = perf_counter() if timings else 0
+    
+    # Fast path: most text contains no markup characters at all, which one
+    # regex search (a C-level scan) can tell. Such text becomes a single
+    # plain leaf without building any TextNodes
+    if SPECIAL_CHARACTERS.search(text) is None:
+        if timings:
+            timings.add("inline_parsing", perf_counter() - start)
+            timings.count("inline_texts")
+            timings.count("inline_fast_path")
+        return [LeafNode(None, text)] if text else []
+    
     # Convert text to TextNodes (handles inline markdown)
     text_nodes = text_to_textnodes(text)
-    
-    # Convert TextNodes to HTMLNodes
-    html_nodes = []
-    for text_node in text_nodes:
-        html_node = text_node_to_html_node(text_node)
-        html_nodes.append(html_node)
-    
-    return html_nodes
+    if timings:
+        timings.add("inline_parsing", perf_counter() - start)
+        timings.count("inline_texts")
+    
+    # Render the TextNodes directly, keeping the URLs for asset tracking
+    urls = []
+    html = text_nodes_to_html(text_nodes, urls)
+    return [RawHTMLNode(html, urls)] if html else []
 
 
-def paragraph_to_html_node(block):
+def paragraph_to_html_node(classified):
     """
     Convert a paragraph block to a <p> HTMLNode.
     
@@ -113,50 +166,40 @@ def paragraph_to_html_node(block):
     be rendered as continuous text with spaces instead of line breaks.
     
     Args:
-        block (str): Paragraph text with potential inline formatting and newlines
+        classified (ClassifiedBlock): Paragraph lines with potential inline formatting
         
     Returns:
         ParentNode: <p> element containing the processed inline content
     """
-    # Convert internal newlines to spaces for proper paragraph formatting
+    # Join the lines with spaces for proper paragraph formatting
     # In markdown, paragraphs can span multiple lines, but HTML paragraphs should be continuous
-    normalized_text = block.replace('\n', ' ')
+    normalized_text = ' '.join(classified.lines)
     
     children = text_to_children(normalized_text)
     return ParentNode("p", children)
 
 
-def heading_to_html_node(block):
+def heading_to_html_node(classified):
     """
     Convert a heading block to an <h1>-<h6> HTMLNode.
     
     Args:
-        block (str): Heading text starting with 1-6 # characters
+        classified (ClassifiedBlock): Heading text (after the #'s and space)
+            and its level
         
     Returns:
         ParentNode: <h1>-<h6> element containing the heading content
     """
-    # Count the number of # characters to determine heading level
-    hash_count = 0
-    for char in block:
-        if char == '#':
-            hash_count += 1
-        else:
-            break
-    
-    # Extract the heading text (everything after "# " or "## ", etc.)
-    heading_text = block[hash_count + 1:]  # Skip the hashes and space
-    
     # Create the appropriate heading tag
-    heading_tag = f"h{hash_count}"
+    heading_tag = f"h{classified.level}"
     
     # Process inline content within the heading
-    children = text_to_children(heading_text)
+    children = text_to_children(classified.lines[0])
     
     return ParentNode(heading_tag, children)
 
 
-def code_to_html_node(block):
+def code_to_html_node(classified):
     """
     Convert a code block to a <pre><code> HTMLNode.
     
@@ -164,16 +207,12 @@ def code_to_html_node(block):
     The content is preserved exactly as-is, including trailing newlines.
     
     Args:
-        block (str): Code block text surrounded by ```
+        classified (ClassifiedBlock): The lines between the ``` fences
         
     Returns:
         ParentNode: <pre> element containing <code> element with raw text
     """
-    # Extract the code content by removing the opening and closing ```
-    lines = block.split('\n')
-    
-    # Remove first line (```[language]) and last line (```)
-    code_lines = lines[1:-1]
+    code_lines = classified.lines
     code_content = '\n'.join(code_lines)
     
     # Add trailing newline to match expected test behavior
@@ -188,29 +227,18 @@ def code_to_html_node(block):
     return ParentNode("pre", [code_node])
 
 
-def quote_to_html_node(block):
+def quote_to_html_node(classified):
     """
     Convert a quote block to a <blockquote> HTMLNode.
     
     Args:
-        block (str): Quote text with each line starting with >
+        classified (ClassifiedBlock): Quote lines with the > already removed
         
     Returns:
         ParentNode: <blockquote> element containing the quote content
     """
-    # Remove the > character from each line
-    lines = block.split('\n')
-    quote_lines = []
-    
-    for line in lines:
-        # Remove the > and any space after it
-        if line.startswith('> '):
-            quote_lines.append(line[2:])  # Remove "> "
-        elif line.startswith('>'):
-            quote_lines.append(line[1:])  # Remove just ">"
-    
     # Join the quote content back together
-    quote_text = '\n'.join(quote_lines)
+    quote_text = '\n'.join(classified.lines)
     
     # Process inline content within the quote
     children = text_to_children(quote_text)
@@ -218,63 +246,33 @@ def quote_to_html_node(block):
     return ParentNode("blockquote", children)
 
 
-def unordered_list_to_html_node(block):
+def unordered_list_to_html_node(classified):
     """
     Convert an unordered list block to a <ul> HTMLNode.
     
     Args:
-        block (str): Unordered list with each line starting with "- "
+        classified (ClassifiedBlock): List items with the "- " already removed
         
     Returns:
         ParentNode: <ul> element containing <li> elements
     """
-    # Split into individual list items
-    lines = block.split('\n')
-    list_items = []
-    
-    for line in lines:
-        # Remove the "- " prefix from each line
-        item_text = line[2:]  # Remove "- "
-        
-        # Process inline content within the list item
-        item_children = text_to_children(item_text)
-        
-        # Create <li> element for this item
-        list_item = ParentNode("li", item_children)
-        list_items.append(list_item)
-    
-    # Wrap all items in <ul> element
-    return ParentNode("ul", list_items)
+    return ParentNode("ul", _list_items(classified.lines))
 
 
-def ordered_list_to_html_node(block):
+def ordered_list_to_html_node(classified):
     """
     Convert an ordered list block to an <ol> HTMLNode.
     
     Args:
-        block (str): Ordered list with each line starting with "1. ", "2. ", etc.
+        classified (ClassifiedBlock): List items with the "1. ", "2. ", ...
+            already removed
         
     Returns:
         ParentNode: <ol> element containing <li> elements
     """
-    # Split into individual list items
-    lines = block.split('\n')
-    list_items = []
-    
-    for line in lines:
-        # Find the ". " and extract text after it
-        dot_index = line.find('. ')
-        if dot_index != -1:
-            item_text = line[dot_index + 2:]  # Text after ". "
-            
-            # Process inline content within the list item
-            item_children = text_to_children(item_text)
-            
-            # Create <li> element for this item
-            list_item = ParentNode("li", item_children)
-            list_items.append(list_item)
-    
-    # Wrap all items in <ol> element
-    return ParentNode("ol", list_items)
+    return ParentNode("ol", _list_items(classified.lines))
 
 
+def _list_items(items):
+    # One <li> per item, with inline content processed
+    return [ParentNode("li", text_to_children(item_text)) for item_text in items]
@@ -0,0 +1,217 @@
+from array import array
+from leafnode import LeafNode
+from parentnode import ParentNode
+from rawhtmlnode import RawHTMLNode
+
+# Opcodes. Each op has two int arguments, which index the arena's string
+# table (or its URL lists for RAW); unused arguments are -1
+OPEN = 0        # tag: start of a ParentNode, closed by a later CLOSE
+OPEN_LEAF = 1   # tag: start of a tagged LeafNode; its TEXT and CLOSE follow
+ATTR = 2        # key, value: an attribute of the element just opened
+TEXT = 3        # value: text, or the value of the enclosing tagged leaf
+CLOSE = 4       # closes the innermost open element
+RAW = 5         # html, urls: pre-rendered HTML, e.g. a RawHTMLNode
+
+
+class NodeArena:
+    """
+    A whole HTML node tree stored flat, as a sequence of opcodes.
+
+    Where an HTMLNode tree is one Python object per element (plus a props
+    dict and a children list), the arena is two int arrays and a table of
+    distinct strings: a page is a handful of objects however many elements
+    it has. That makes it cheap to keep around, to pickle (e.g. between
+    build worker processes) and to cache. Repeated strings such as tag
+    names and attribute keys are stored once.
+
+    The tree is written in document order: OPEN/OPEN_LEAF, its ATTRs, its
+    contents, then CLOSE. A LeafNode without a tag is a single TEXT op and
+    a RawHTMLNode (e.g. a CachedBlockNode) a single RAW op.
+
+    Example:
+        arena = NodeArena.from_node(markdown_to_html_node(markdown))
+        html = arena.to_html()       # same HTML as the tree
+        node = arena.to_node()       # back to HTMLNodes
+    """
+
+    __slots__ = ("ops", "args", "strings", "url_lists")
+
+    def __init__(self):
+        self.ops = array("b")
+        self.args = array("i")
+        self.strings = []
+        self.url_lists = []
+
+    def __len__(self):
+        return len(self.ops)
+
+    @classmethod
+    def from_node(cls, node):
+        """
+        Flatten an HTMLNode tree into a new arena.
+
+        The tree is walked with an explicit stack, so deep trees are fine,
+        and checked like to_html would check it.
+
+        Raises:
+            ValueError: For a ParentNode without a tag or children, a
+                LeafNode without a value, or any other kind of node
+        """
+        arena = cls()
+        ops = arena.ops
+        args = arena.args
+        strings = arena.strings
+        # String -> index in strings, so each distinct string is kept once
+        index = {}
+
+        def intern(text):
+            position = index.get(text)
+            if position is None:
+                position = index[text] = len(strings)
+                strings.append(text)
+            return position
+
+        def emit(op, first=-1, second=-1):
+            ops.append(op)
+            args.append(first)
+            args.append(second)
+
+        def emit_props(props):
+            if props:
+                for key, value in props.items():
+                    emit(ATTR, intern(key), intern(value))
+
+        # Nodes still to flatten, last first; None stands for a CLOSE
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if current is None:
+                emit(CLOSE)
+            elif isinstance(current, ParentNode):
+                if current.tag is None:
+                    raise ValueError("ParentNode must have a tag")
+                if current.children is None:
+                    raise ValueError("ParentNode must have children")
+                emit(OPEN, intern(current.tag))
+                emit_props(current.props)
+                stack.append(None)
+                stack.extend(reversed(current.children))
+            elif isinstance(current, RawHTMLNode):
+                emit(RAW, intern(current.value), len(arena.url_lists))
+                arena.url_lists.append(list(current.urls))
+            elif isinstance(current, LeafNode):
+                if current.value is None:
+                    raise ValueError("LeafNode must have a value")
+                if current.tag is None:
+                    emit(TEXT, intern(current.value))
+                else:
+                    emit(OPEN_LEAF, intern(current.tag))
+                    emit_props(current.props)
+                    emit(TEXT, intern(current.value))
+                    emit(CLOSE)
+            else:
+                raise ValueError(f"Unsupported node type: {type(current).__name__}")
+
+        return arena
+
+    def to_node(self):
+        """
+        Rebuild the HTMLNode tree. RAW ops come back as RawHTMLNodes.
+
+        Returns:
+            HTMLNode: The root node, or None for an empty arena
+        """
+        ops = self.ops
+        args = self.args
+        strings = self.strings
+        # Children lists of the elements still open, innermost last, and
+        # [kind, tag, props] for each of those elements
+        children = [[]]
+        open_elements = []
+        for i, op in enumerate(ops):
+            first = args[2 * i]
+            if op == OPEN or op == OPEN_LEAF:
+                open_elements.append([op, strings[first], None])
+                children.append([])
+            elif op == ATTR:
+                # Attributes directly follow the element they belong to
+                element = open_elements[-1]
+                if element[2] is None:
+                    element[2] = {}
+                element[2][strings[first]] = strings[args[2 * i + 1]]
+            elif op == TEXT:
+                children[-1].append(LeafNode(None, strings[first]))
+            elif op == RAW:
+                children[-1].append(RawHTMLNode(strings[first], self.url_lists[args[2 * i + 1]]))
+            else:
+                kind, tag, props = open_elements.pop()
+                contents = children.pop()
+                if kind == OPEN_LEAF:
+                    children[-1].append(LeafNode(tag, contents[0].value, props))
+                else:
+                    children[-1].append(ParentNode(tag, contents, props))
+
+        roots = children[0]
+        return roots[0] if roots else None
+
+    def to_html_iter(self):
+        """
+        Yield the HTML in chunks that join up to to_html(): the root's
+        opening tag, each of its children, then its closing tag, like
+        ParentNode.to_html_iter. Chunks never split a tag.
+        """
+        ops = self.ops
+        strings = self.strings
+        parts = []
+        append = parts.append
+        closing_tags = []
+        depth = 0
+        pairs = iter(self.args)
+        for op, first, second in zip(ops, pairs, pairs):
+            if op == ATTR:
+                # Attributes directly follow their element, whose opening
+                # tag is still the last part
+                parts[-1] = f'{parts[-1][:-1]} {strings[first]}="{strings[second]}">'
+                continue
+            # Hand over a chunk whenever the walk is back in the root element
+            if depth <= 1 and parts:
+                yield "".join(parts)
+                parts.clear()
+            if op == TEXT or op == RAW:
+                append(strings[first])
+            elif op == CLOSE:
+                append(closing_tags.pop())
+                depth -= 1
+            else:
+                tag = strings[first]
+                append(f"<{tag}>")
+                closing_tags.append(f"</{tag}>")
+                depth += 1
+        if parts:
+            yield "".join(parts)
+
+    def to_html(self):
+        return "".join(self.to_html_iter())
+
+    def write_to(self, file):
+        """Write the HTML to a text file, chunk by chunk."""
+        file.writelines(self.to_html_iter())
+
+    def root_urls(self):
+        """
+        The root-relative href/src URLs in the tree, as collect_root_urls
+        would find them in the HTMLNode tree (in document order).
+        """
+        urls = []
+        ops = self.ops
+        args = self.args
+        strings = self.strings
+        for i, op in enumerate(ops):
+            if op == ATTR:
+                if strings[args[2 * i]] in ("href", "src"):
+                    url = strings[args[2 * i + 1]]
+                    if url and url.startswith("/"):
+                        urls.append(url)
+            elif op == RAW:
+                urls.extend(self.url_lists[args[2 * i + 1]])
+        return urls
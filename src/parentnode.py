@@ -1,22 +1,85 @@
 from htmlnode import HTMLNode
 
+# Levels rendered by recursion before to_html switches to an explicit
+# stack; well within the default recursion limit of 1000
+MAX_RECURSION_DEPTH = 100
+
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, children, props=None):
         super().__init__(tag, None, children, props)
 
     def to_html(self):
-        if self.tag is None:
-            raise ValueError("ParentNode must have a tag")
+        """
+        Render this node and all its descendants.
 
-        if self.children is None:
+        Every piece of HTML is appended to one shared list that is joined
+        once at the end, so wide trees are rendered in linear time. Each
+        level recurses, which is the fastest way to walk a shallow tree;
+        below MAX_RECURSION_DEPTH levels the rest of the subtree is walked
+        with an explicit stack instead, so deeply nested trees cannot hit
+        the recursion limit.
+        """
+        parts = []
+        self._render_into(parts.append, 0)
+        return "".join(parts)
+
+    def _render_into(self, append, depth):
+        if depth >= MAX_RECURSION_DEPTH:
+            self._render_with_stack(append)
+            return
+        # The checks of _opening_tag, inlined: this runs once per element
+        tag = self.tag
+        if tag is None:
+            raise ValueError("ParentNode must have a tag")
+        children = self.children
+        if children is None:
             raise ValueError("ParentNode must have children")
+        append(f"<{tag}{self.props_to_html()}>" if self.props else f"<{tag}>")
+        for child in children:
+            if isinstance(child, ParentNode):
+                child._render_into(append, depth + 1)
+            else:
+                append(child.to_html())
+        append(f"</{tag}>")
 
-        opening_tag = f"<{self.tag}{self.props_to_html()}>"
+    def _render_with_stack(self, append):
+        append(self._opening_tag())
+        # One entry per open element: an iterator over the children still
+        # to render, and the closing tag to emit once they are done
+        stack = [(iter(self.children), f"</{self.tag}>")]
+        while stack:
+            children, closing_tag = stack[-1]
+            for child in children:
+                if isinstance(child, ParentNode):
+                    # Descend; the rest of this node's children are
+                    # resumed from the same iterator afterwards
+                    append(child._opening_tag())
+                    stack.append((iter(child.children), f"</{child.tag}>"))
+                    break
+                append(child.to_html())
+            else:
+                append(closing_tag)
+                stack.pop()
 
-        children_html = ""
+    def to_html_iter(self):
+        """
+        Yield this node's HTML one child at a time: the opening tag, the
+        HTML of each child, then the closing tag. For a page's top-level
+        div that is one chunk per block, so streaming a page never holds
+        more than one rendered block in memory.
+        """
+        yield self._opening_tag()
         for child in self.children:
-            children_html += child.to_html()
+            yield child.to_html()
+        yield f"</{self.tag}>"
+
+    def _opening_tag(self):
+        if self.tag is None:
+            raise ValueError("ParentNode must have a tag")
 
-        closing_tag = f"</{self.tag}>"
+        if self.children is None:
+            raise ValueError("ParentNode must have children")
 
-        return f"{opening_tag}{children_html}{closing_tag}"
+        return f"<{self.tag}{self.props_to_html()}>"
@@ -0,0 +1,72 @@
+from block_cache import CachedBlockNode, collect_root_urls
+from markdown_to_html_node import markdown_to_html_node
+
+
+class ParseSession:
+    """
+    Re-parses successive versions of one document at block granularity.
+
+    The session remembers the rendered HTML of every block in the previous
+    version, keyed by the hash of the block text. Parsing a new version
+    only runs block_to_html_node for blocks whose text changed; unchanged
+    blocks, even if they moved, are spliced in from the previous version.
+    A one-character edit in a long post therefore re-parses a single block.
+
+    It can be passed to markdown_to_html_node (or generate_page) as the
+    block_cache, after calling begin() for each new version; parse() does
+    both. With a shared BlockCache, blocks new to this document are also
+    looked up in and added to it.
+
+    Example:
+        session = ParseSession()
+        session.parse(markdown)          # parses every block
+        session.parse(edited_markdown)   # parses only the edited block
+    """
+
+    def __init__(self, block_cache=None):
+        self.block_cache = block_cache
+        self.previous = {}
+        self.current = {}
+        self.reused = 0
+        self.reparsed = 0
+
+    def begin(self):
+        """Start a new version of the document."""
+        # A version that was never parsed (e.g. skipped as unchanged) must
+        # not throw away the blocks of the last one that was
+        if self.current:
+            self.previous = self.current
+            self.current = {}
+
+    def parse(self, markdown, metadata=None):
+        """
+        Parse a new version of the document.
+
+        Returns:
+            ParentNode: The same tree markdown_to_html_node would return,
+            with each block as a CachedBlockNode
+        """
+        self.begin()
+        return markdown_to_html_node(markdown, self, metadata)
+
+    def get(self, key):
+        entry = self.current.get(key) or self.previous.get(key)
+        if entry is None and self.block_cache is not None:
+            node = self.block_cache.get(key)
+            if node is not None:
+                entry = (node.value, node.urls, node.warnings)
+        if entry is None:
+            return None
+        self.reused += 1
+        self.current[key] = entry
+        return CachedBlockNode(*entry)
+
+    def put(self, key, node, warnings=()):
+        if self.block_cache is not None:
+            node = self.block_cache.put(key, node, warnings)
+            entry = (node.value, node.urls, node.warnings)
+        else:
+            entry = (node.to_html(), collect_root_urls(node), list(warnings))
+        self.reparsed += 1
+        self.current[key] = entry
+        return CachedBlockNode(*entry)
@@ -0,0 +1,67 @@
+from collections import namedtuple
+
+
+class ParseWarning(namedtuple("ParseWarning", ["path", "line", "message"])):
+    """A problem the parser recovered from, e.g. an unmatched delimiter."""
+
+    def __str__(self):
+        location = self.path or "<markdown>"
+        if self.line is not None:
+            location = f"{location}:{self.line}"
+        return f"{location}: {self.message}"
+
+
+# Collector for the document currently being parsed in this process, if any.
+# Like build_timings.current_page(), the parser consults it so recording
+# costs nothing when nobody is listening.
+_current = None
+
+
+def warn(message):
+    """Record a warning against the document being parsed, if any."""
+    if _current is not None:
+        _current.add(message)
+
+
+class ParseWarnings:
+    """
+    Collects the warnings raised while parsing one document.
+
+    Used as a context manager around the parse; markdown_to_html_node keeps
+    `line` pointing at the first line of the block being converted, so each
+    warning carries the file and line it came from.
+
+    Example:
+        with ParseWarnings("content/index.md") as warnings:
+            node = markdown_to_html_node(markdown)
+        for warning in warnings:
+            print(f"Warning: {warning}")
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.line = None
+        self.warnings = []
+
+    def add(self, message):
+        self.warnings.append(ParseWarning(self.path, self.line, message))
+
+    def __iter__(self):
+        return iter(self.warnings)
+
+    def __len__(self):
+        return len(self.warnings)
+
+    def __enter__(self):
+        global _current
+        self._previous = _current
+        _current = self
+        return self
+
+    def __exit__(self, *exc_info):
+        global _current
+        _current = self._previous
+
+
+def current_warnings():
+    return _current
@@ -0,0 +1,15 @@
+from leafnode import LeafNode
+
+class RawHTMLNode(LeafNode):
+    """
+    A run of HTML that was rendered without building a node per element,
+    e.g. the inline content of a block or a block taken from the cache.
+    It renders as the HTML as-is and remembers the root-relative href/src
+    URLs inside it, so asset dependencies are still recorded.
+    """
+
+    __slots__ = ("urls",)
+
+    def __init__(self, html, urls):
+        super().__init__(None, html)
+        self.urls = urls
@@ -1,4 +1,5 @@
 from textnode import TextNode, TextType
+from parse_warnings import warn
 
 
 def split_nodes_delimiter(old_nodes, delimiter, text_type):
@@ -16,8 +17,8 @@ def split_nodes_delimiter(old_nodes, delimiter, text_type):
     Returns:
         list: New list of TextNode objects with delimiter-based formatting applied
         
-    Raises:
-        ValueError: If a delimiter is opened but not closed (unmatched delimiter)
+    An unmatched final delimiter is kept as literal text and a warning is
+    recorded (see parse_warnings) instead of failing the build.
         
     Example:
         Input: [TextNode("Text with **bold** word", TextType.PLAIN)]
@@ -37,7 +38,7 @@ def split_nodes_delimiter(old_nodes, delimiter, text_type):
            - Split text on delimiter
            - Odd indices = normal text (outside delimiters)
            - Even indices = formatted text (inside delimiters)
-           - Validate that delimiters are properly paired
+           - If the delimiters do not pair up, the last one is literal
     """
     new_nodes = []
     
@@ -56,7 +57,9 @@ def split_nodes_delimiter(old_nodes, delimiter, text_type):
         # So odd number of parts means even number of delimiters (matched pairs)
         # Even number of parts means odd number of delimiters (unmatched)
         if len(split_parts) % 2 == 0:
-            raise ValueError(f"Unmatched delimiter '{delimiter}' in text: {old_node.text}")
+            # Glue the text around the unmatched delimiter back together
+            warn(f"unmatched '{delimiter}' treated as literal text")
+            split_parts[-2:] = [split_parts[-2] + delimiter + split_parts[-1]]
         
         # Process each part of the split
         for i, part in enumerate(split_parts):
@@ -1,5 +1,5 @@
 from textnode import TextNode, TextType
-from extract_markdown import extract_markdown_images, extract_markdown_links
+from extract_markdown import LinkScanner
 
 
 def split_nodes_image(old_nodes):
@@ -26,60 +26,13 @@ def split_nodes_image(old_nodes):
     Algorithm:
         1. For each node in old_nodes:
            - If not PLAIN type: add to result unchanged
-           - If PLAIN type: extract images and split around them
+           - If PLAIN type: find images and split around them
         2. Split process:
-           - Extract all images from text using regex
-           - For each image, split text around the image markdown
-           - Create nodes for text before, the image itself, and continue with remaining text
-           - Handle multiple images by processing recursively
+           - Walk the images found by LinkScanner in order, using their offsets
+           - Slice out the text before each image, then the image itself
+           - Whatever follows the last image becomes the final PLAIN node
     """
-    new_nodes = []
-    
-    for old_node in old_nodes:
-        # Only process PLAIN type nodes - leave other types unchanged
-        if old_node.text_type != TextType.PLAIN:
-            new_nodes.append(old_node)
-            continue
-        
-        # Extract all images from this node's text
-        images = extract_markdown_images(old_node.text)
-        
-        # If no images found, keep the original node
-        if not images:
-            new_nodes.append(old_node)
-            continue
-        
-        # Process the text by splitting around each image
-        current_text = old_node.text
-        
-        for alt_text, url in images:
-            # Construct the full markdown syntax for this image
-            image_markdown = f"![{alt_text}]({url})"
-            
-            # Split the current text around this image (only first occurrence)
-            sections = current_text.split(image_markdown, 1)
-            
-            if len(sections) != 2:
-                # This shouldn't happen if extraction worked correctly
-                continue
-            
-            before_text, after_text = sections
-            
-            # Add the text before the image (if not empty)
-            if before_text:
-                new_nodes.append(TextNode(before_text, TextType.PLAIN, old_node.url))
-            
-            # Add the image node
-            new_nodes.append(TextNode(alt_text, TextType.IMAGE, url))
-            
-            # Continue processing with the text after this image
-            current_text = after_text
-        
-        # Add any remaining text after all images (if not empty)
-        if current_text:
-            new_nodes.append(TextNode(current_text, TextType.PLAIN, old_node.url))
-    
-    return new_nodes
+    return _split_nodes(old_nodes, LinkScanner.images, TextType.IMAGE)
 
 
 def split_nodes_link(old_nodes):
@@ -105,7 +58,18 @@ def split_nodes_link(old_nodes):
         
     Algorithm:
         Same as split_nodes_image but for links instead of images.
-        Uses extract_markdown_links to find link syntax.
+        Uses LinkScanner.links to find link syntax.
+    """
+    return _split_nodes(old_nodes, LinkScanner.links, TextType.LINK)
+
+
+def _split_nodes(old_nodes, find_matches, text_type):
+    """
+    Split PLAIN nodes around every image or link found by find_matches
+    (LinkScanner.images or LinkScanner.links).
+    
+    Works from the match offsets reported by the scanner, so each node's text
+    is walked once and every piece is sliced out exactly once.
     """
     new_nodes = []
     
@@ -115,44 +79,23 @@ def split_nodes_link(old_nodes):
             new_nodes.append(old_node)
             continue
         
-        # Extract all links from this node's text
-        links = extract_markdown_links(old_node.text)
-        
-        # If no links found, keep the original node
-        if not links:
-            new_nodes.append(old_node)
-            continue
+        text = old_node.text
+        cursor = 0
         
-        # Process the text by splitting around each link
-        current_text = old_node.text
-        
-        for anchor_text, url in links:
-            # Construct the full markdown syntax for this link
-            link_markdown = f"[{anchor_text}]({url})"
-            
-            # Split the current text around this link (only first occurrence)
-            sections = current_text.split(link_markdown, 1)
-            
-            if len(sections) != 2:
-                # This shouldn't happen if extraction worked correctly
-                continue
-            
-            before_text, after_text = sections
-            
-            # Add the text before the link (if not empty)
-            if before_text:
-                new_nodes.append(TextNode(before_text, TextType.PLAIN, old_node.url))
+        for match in find_matches(LinkScanner(text)):
+            # Add the text between the previous match and this one (if not empty)
+            if match.start > cursor:
+                new_nodes.append(TextNode(text[cursor:match.start], TextType.PLAIN, old_node.url))
             
-            # Add the link node
-            new_nodes.append(TextNode(anchor_text, TextType.LINK, url))
-            
-            # Continue processing with the text after this link
-            current_text = after_text
+            # Add the image/link node
+            new_nodes.append(TextNode(match.label, text_type, match.url))
+            cursor = match.end
         
-        # Add any remaining text after all links (if not empty)
-        if current_text:
-            new_nodes.append(TextNode(current_text, TextType.PLAIN, old_node.url))
+        if cursor == 0:
+            # No matches found, keep the original node
+            new_nodes.append(old_node)
+        elif cursor < len(text):
+            # Add any remaining text after the last match
+            new_nodes.append(TextNode(text[cursor:], TextType.PLAIN, old_node.url))
     
     return new_nodes
-
-
@@ -0,0 +1,169 @@
+import json
+import os
+import shutil
+import time
+from static_sync import walk_files
+
+
+def link_tree(src_dir, dest_dir):
+    """
+    Recreate src_dir at dest_dir using hardlinks, falling back to copies
+    where linking is not possible. Used to seed a staging directory with
+    the previous build so that incremental builds only rewrite what changed.
+    """
+    os.makedirs(dest_dir, exist_ok=True)
+    for relative_path in walk_files(src_dir):
+        src_path = os.path.join(src_dir, relative_path)
+        dest_path = os.path.join(dest_dir, relative_path)
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        try:
+            os.link(src_path, dest_path)
+        except OSError:
+            shutil.copy2(src_path, dest_path)
+
+
+class StagedOutput:
+    """
+    Build into a staging directory and publish it with an atomic swap.
+
+    The served path (e.g. docs) is a symlink to one of the completed builds
+    kept in builds_dir. A build is written to builds_dir/staging, seeded
+    with hardlinks to the live build, then renamed to builds_dir/build-<n>
+    and published by atomically replacing the symlink, so readers only
+    ever see a complete site.
+
+    builds_dir/history.json lists the builds that have been live, oldest
+    first. Publishing pushes the new build, rolling back pops the live one,
+    and pruning keeps the live build plus the `keep` builds that were live
+    right before it. A build that was rolled away from is no longer in the
+    history, so it is pruned rather than kept in place of an older good one.
+
+    Files in the staging directory may share inodes with the live build,
+    so everything writing into it must replace files (write a temporary
+    file and rename it over the target) rather than modify them in place.
+    """
+
+    def __init__(self, live_path, builds_dir, keep=1):
+        self.live_path = live_path
+        self.builds_dir = builds_dir
+        self.keep = keep
+        self.staging_path = os.path.join(builds_dir, "staging")
+        self.history_path = os.path.join(builds_dir, "history.json")
+
+    def builds(self):
+        """Completed builds, oldest first."""
+        if not os.path.isdir(self.builds_dir):
+            return []
+        names = [name for name in os.listdir(self.builds_dir) if name.startswith("build-")]
+        return [os.path.join(self.builds_dir, name) for name in sorted(names)]
+
+    def live_build(self):
+        if os.path.islink(self.live_path):
+            return os.path.join(os.path.dirname(self.live_path), os.readlink(self.live_path))
+        return None
+
+    def history(self):
+        """Builds that have been live and still exist, least recent first."""
+        if os.path.exists(self.history_path):
+            with open(self.history_path, 'r') as f:
+                names = json.load(f)
+        else:
+            # Builds published before the history was recorded: assume they
+            # went live in order, up to the live one
+            names = [os.path.basename(path) for path in self.builds()]
+            live = self.live_build()
+            if live is not None and os.path.basename(live) in names:
+                names = names[:names.index(os.path.basename(live)) + 1]
+        paths = [os.path.join(self.builds_dir, name) for name in names]
+        return [path for path in paths if os.path.isdir(path)]
+
+    def _save_history(self, history):
+        temp_path = f"{self.history_path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump([os.path.basename(path) for path in history], f, indent=2)
+        os.replace(temp_path, self.history_path)
+
+    def prepare(self):
+        """
+        Create a fresh staging directory seeded from the live site.
+
+        Returns:
+            str: Path of the staging directory to build into
+        """
+        os.makedirs(self.builds_dir, exist_ok=True)
+        if os.path.exists(self.staging_path):
+            shutil.rmtree(self.staging_path)
+
+        if os.path.exists(self.live_path):
+            link_tree(self.live_path, self.staging_path)
+        else:
+            os.makedirs(self.staging_path)
+        return self.staging_path
+
+    def publish(self):
+        """
+        Turn the staging directory into a numbered build and make it live.
+
+        Returns:
+            str: Path of the published build
+        """
+        history = self.history()
+        build_path = os.path.join(self.builds_dir, f"build-{time.time_ns()}")
+        os.rename(self.staging_path, build_path)
+
+        if os.path.isdir(self.live_path) and not os.path.islink(self.live_path):
+            # First staged build: move the plain output directory aside so
+            # the live path can become a symlink. This one-time migration is
+            # the only moment the live path is briefly missing.
+            first_build = os.path.join(self.builds_dir, "build-0")
+            os.rename(self.live_path, first_build)
+            history.append(first_build)
+
+        self._point_live_at(build_path)
+        history.append(build_path)
+        self._save_history(history)
+        self.prune()
+        return build_path
+
+    def rollback(self):
+        """
+        Make the build that was live before the current one live again.
+
+        Returns:
+            str: Path of the build that is now live
+        """
+        history = self.history()
+        if len(history) < 2:
+            raise ValueError("No previous build to roll back to")
+
+        history.pop()
+        previous = history[-1]
+        self._point_live_at(previous)
+        self._save_history(history)
+        return previous
+
+    def prune(self):
+        """Delete every build except the live one and its `keep` predecessors."""
+        kept = self.history()[-(self.keep + 1):]
+        live = self.live_build()
+        if live is not None:
+            kept.append(live)
+        for build_path in self.builds():
+            if not any(os.path.samefile(build_path, path) for path in kept):
+                shutil.rmtree(build_path)
+
+    def clear(self):
+        """Remove the live symlink along with every build and the history."""
+        if os.path.islink(self.live_path):
+            os.remove(self.live_path)
+        if os.path.isdir(self.builds_dir):
+            shutil.rmtree(self.builds_dir)
+
+    def _point_live_at(self, build_path):
+        target = os.path.relpath(build_path, os.path.dirname(self.live_path) or ".")
+        temp_link = f"{self.live_path}.swap"
+        if os.path.lexists(temp_link):
+            os.remove(temp_link)
+        os.symlink(target, temp_link)
+        # rename() over an existing symlink is atomic on POSIX
+        os.replace(temp_link, self.live_path)
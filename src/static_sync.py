@@ -0,0 +1,106 @@
+import os
+from build_manifest import hash_file
+from asset_materializer import AssetMaterializer
+
+
+class SyncResult:
+    """Counters and the set of synced files produced by sync_static."""
+
+    def __init__(self):
+        self.files = set()
+        self.copied = 0
+        self.unchanged = 0
+        self.removed = 0
+
+    def summary(self):
+        return (f"Static files: copied {self.copied}, unchanged {self.unchanged}, "
+                f"removed {self.removed}")
+
+
+def walk_files(root):
+    """Yield the path of every file under root, relative to root."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            yield os.path.relpath(os.path.join(dirpath, filename), root)
+
+
+def is_unchanged(src_path, dest_path, checksum=False):
+    """
+    Decide whether dest_path is already an up-to-date copy of src_path.
+
+    Files of different sizes always differ. Otherwise the modification times
+    are compared (copies keep the source mtime), or, with checksum=True, the
+    contents are hashed so touched-but-identical files are not recopied.
+    """
+    try:
+        dest_stat = os.stat(dest_path)
+    except FileNotFoundError:
+        return False
+
+    src_stat = os.stat(src_path)
+    if src_stat.st_size != dest_stat.st_size:
+        return False
+
+    if checksum:
+        return hash_file(src_path) == hash_file(dest_path)
+
+    return src_stat.st_mtime_ns == dest_stat.st_mtime_ns
+
+
+def sync_static(src_dir, dest_dir, previous_files=(), checksum=False, materializer=None):
+    """
+    Bring the static assets in dest_dir in line with src_dir.
+
+    Only new or changed files are copied. Files listed in previous_files
+    (the assets synced by the last build) whose source has since been
+    deleted are removed. Anything else in dest_dir, such as generated HTML,
+    is left alone.
+
+    Args:
+        src_dir (str): Directory of static assets
+        dest_dir (str): Output directory
+        previous_files (iterable): Relative paths synced by the previous build
+        checksum (bool): Compare file contents instead of modification times
+        materializer (AssetMaterializer): How files are copied (default: plain copy)
+
+    Returns:
+        SyncResult: What was copied, kept and removed
+    """
+    if materializer is None:
+        materializer = AssetMaterializer("copy")
+
+    result = SyncResult()
+
+    for relative_path in walk_files(src_dir):
+        src_path = os.path.join(src_dir, relative_path)
+        dest_path = os.path.join(dest_dir, relative_path)
+        result.files.add(relative_path)
+
+        if is_unchanged(src_path, dest_path, checksum):
+            result.unchanged += 1
+            continue
+
+        print(f"Copying file: {src_path} -> {dest_path}")
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        materializer.materialize(src_path, dest_path)
+        result.copied += 1
+
+    for relative_path in sorted(set(previous_files) - result.files):
+        dest_path = os.path.join(dest_dir, relative_path)
+        if os.path.exists(dest_path):
+            print(f"Removing deleted file: {dest_path}")
+            os.remove(dest_path)
+            remove_empty_dirs(os.path.dirname(dest_path), dest_dir)
+            result.removed += 1
+
+    return result
+
+
+def remove_empty_dirs(path, stop_dir):
+    """Remove path and its parents while they are empty, stopping at stop_dir."""
+    stop_dir = os.path.abspath(stop_dir)
+    path = os.path.abspath(path)
+    while path != stop_dir and path.startswith(stop_dir) and not os.listdir(path):
+        os.rmdir(path)
+        path = os.path.dirname(path)
@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+from asset_materializer import AssetMaterializer, STRATEGIES
+from test_support import read_file
+
+
+class TestAssetMaterializer(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.src = os.path.join(self.tmp.name, "image.png")
+        self.dest = os.path.join(self.tmp.name, "copy.png")
+        with open(self.src, 'wb') as f:
+            f.write(b"\x89PNG" + b"x" * 1000)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_every_strategy_produces_identical_copy(self):
+        for strategy in ["auto"] + STRATEGIES:
+            with self.subTest(strategy=strategy):
+                materializer = AssetMaterializer(strategy)
+                used = materializer.materialize(self.src, self.dest)
+                self.assertIn(used, STRATEGIES)
+                self.assertEqual(read_file(self.dest, 'rb'), read_file(self.src, 'rb'))
+                self.assertEqual(os.stat(self.dest).st_mtime_ns, os.stat(self.src).st_mtime_ns)
+
+    def test_copy_avoids_nothing(self):
+        materializer = AssetMaterializer("copy")
+        materializer.materialize(self.src, self.dest)
+        self.assertEqual(materializer.files, {"copy": 1})
+        self.assertEqual(materializer.bytes_avoided, 0)
+
+    def test_hardlink_shares_inode(self):
+        materializer = AssetMaterializer("hardlink")
+        if materializer.materialize(self.src, self.dest) != "hardlink":
+            self.skipTest("hardlinks not supported here")
+        self.assertTrue(os.path.samefile(self.src, self.dest))
+        self.assertEqual(materializer.bytes_avoided, os.path.getsize(self.src))
+
+    def test_replacing_hardlink_does_not_touch_source(self):
+        with open(self.dest, 'wb') as f:
+            f.write(b"old")
+        os.remove(self.dest)
+        os.link(self.src, self.dest)
+        original = read_file(self.src, 'rb')
+        AssetMaterializer("copy").materialize(self.src, self.dest)
+        self.assertEqual(read_file(self.src, 'rb'), original)
+        self.assertFalse(os.path.samefile(self.src, self.dest))
+
+    def test_unsupported_strategy_falls_back(self):
+        materializer = AssetMaterializer("sendfile")
+        materializer.disabled.add("sendfile")
+        self.assertEqual(materializer.materialize(self.src, self.dest), "copy")
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            AssetMaterializer("teleport")
+
+
+if __name__ == "__main__":
+    unittest.main()
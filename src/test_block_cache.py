@@ -0,0 +1,96 @@
+import os
+import tempfile
+import unittest
+from build_manifest import GENERATOR_VERSION, hash_text
+from block_cache import BlockCache, CachedBlockNode, collect_root_urls
+from markdown_to_html_node import markdown_to_html_node
+from parse_warnings import ParseWarnings
+
+
+class TestBlockCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "blocks.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_output_matches_uncached(self):
+        md = "# Title\n\nA **bold** [link](/a.html)\n\n- one\n- two\n\nA **bold** [link](/a.html)"
+        cache = BlockCache()
+        self.assertEqual(markdown_to_html_node(md, cache).to_html(), markdown_to_html_node(md).to_html())
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+
+    def test_shared_blocks_hit_across_pages(self):
+        cache = BlockCache()
+        markdown_to_html_node("# One\n\nFooter text", cache)
+        markdown_to_html_node("# Two\n\nFooter text", cache)
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+
+    def test_cached_block_keeps_root_urls(self):
+        cache = BlockCache()
+        md = "![img](/images/a.png) and [x](https://example.com)"
+        markdown_to_html_node(md, cache)
+        node = markdown_to_html_node(md, cache)
+        self.assertIsInstance(node.children[0], CachedBlockNode)
+        self.assertEqual(collect_root_urls(node), ["/images/a.png"])
+
+    def test_least_recently_used_is_evicted(self):
+        cache = BlockCache(max_entries=2)
+        markdown_to_html_node("a\n\nb", cache)
+        markdown_to_html_node("a", cache)
+        markdown_to_html_node("c", cache)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNotNone(cache.get(hash_text("a")))
+        self.assertIsNone(cache.get(hash_text("b")))
+
+    def test_zero_size_caches_nothing(self):
+        cache = BlockCache(max_entries=0)
+        markdown_to_html_node("a\n\na", cache)
+        self.assertEqual((len(cache), cache.hits), (0, 0))
+
+    def test_persists_between_builds(self):
+        cache = BlockCache(path=self.path)
+        markdown_to_html_node("Some _text_", cache)
+        cache.save()
+        reloaded = BlockCache(path=self.path)
+        self.assertEqual(reloaded.get(hash_text("Some _text_")).to_html(), "<p>Some <i>text</i></p>")
+
+    def test_other_generator_version_is_ignored(self):
+        with open(self.path, 'w') as f:
+            f.write('{"version": "0", "blocks": [["key", "<p>old</p>", []]]}')
+        self.assertEqual(len(BlockCache(path=self.path)), 0)
+
+    def test_warnings_are_reported_for_every_page(self):
+        """Test that a cached block's warnings are replayed with each page's file and line"""
+        cache = BlockCache(path=self.path)
+        with ParseWarnings("a.md") as first:
+            markdown_to_html_node("# A\n\nSome **bad text", cache)
+        with ParseWarnings("b.md") as second:
+            markdown_to_html_node("# B\n\nIntro\n\nSome **bad text", cache)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual([str(w) for w in first], ["a.md:3: unmatched '**' treated as literal text"])
+        self.assertEqual([str(w) for w in second], ["b.md:5: unmatched '**' treated as literal text"])
+
+        cache.save()
+        with ParseWarnings("c.md") as reloaded:
+            markdown_to_html_node("Some **bad text", BlockCache(path=self.path))
+        self.assertEqual([str(w) for w in reloaded], ["c.md:1: unmatched '**' treated as literal text"])
+
+    def test_other_cache_format_is_ignored(self):
+        with open(self.path, 'w') as f:
+            f.write('{"version": "%s", "blocks": [["key", "<p>old</p>", []]]}' % GENERATOR_VERSION)
+        self.assertEqual(len(BlockCache(path=self.path)), 0)
+
+    def test_take_new_and_merge(self):
+        worker = BlockCache()
+        markdown_to_html_node("a\n\na", worker)
+        parent = BlockCache()
+        parent.merge(worker.take_new())
+        self.assertEqual((len(parent), parent.hits, parent.misses), (1, 1, 1))
+        self.assertEqual(worker.take_new(), ([], (0, 0)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import io
+import unittest
+from block_scanner import PageMetadata, iter_blocks, iter_lines, iter_numbered_blocks
+from extract_title import extract_title
+from markdown_to_blocks import markdown_to_blocks
+from markdown_to_html_node import markdown_to_html_node
+from parse_warnings import ParseWarnings
+
+
+class TestBlockScanner(unittest.TestCase):
+
+    def test_iter_lines_string_and_file_agree(self):
+        text = "a\n\nb\nc\n"
+        self.assertEqual(list(iter_lines(text)), ["a", "", "b", "c"])
+        self.assertEqual(list(iter_lines(io.StringIO(text))), ["a", "", "b", "c"])
+        self.assertEqual(list(iter_lines("a\n\n")), ["a", ""])
+
+    def test_blocks_match_split_on_blank_lines(self):
+        md = "\n  # Title  \n\n\n\nOne\ntwo\n\n \n\n- a\n- b\n"
+        self.assertEqual(list(iter_blocks(md)), ["# Title", "One\ntwo", "- a\n- b"])
+
+    def test_whitespace_lines_and_crlf_separate_blocks(self):
+        self.assertEqual(list(iter_blocks("A  \n  \t\nB\r\n\r\nC")), ["A", "B", "C"])
+
+    def test_fenced_code_keeps_blank_lines(self):
+        md = "Intro\n\n```python\ndef f():\n\n    return 1\n```\n\nAfter"
+        self.assertEqual(list(iter_blocks(md)), [
+            "Intro",
+            "```python\ndef f():\n\n    return 1\n```",
+            "After",
+        ])
+
+    def test_single_line_fence_does_not_open_code(self):
+        md = "```inline```\n\nNext"
+        self.assertEqual(list(iter_blocks(md)), ["```inline```", "Next"])
+
+    def test_block_ending_in_fence_closes_code(self):
+        md = "# T\n\n```\ncode```\n\nSome **text** here\n\n```\nmore\n```"
+        self.assertEqual(list(iter_blocks(md)), ["# T", "```\ncode```", "Some **text** here", "```\nmore\n```"])
+        self.assertEqual(markdown_to_html_node(md).to_html(),
+                         "<div><h1>T</h1><pre><code></code></pre><p>Some <b>text</b> here</p>"
+                         "<pre><code>more\n</code></pre></div>")
+
+    def test_unclosed_fence_does_not_swallow_the_document(self):
+        md = "Intro\n\n```\nx\n\npara\n\n- a"
+        with ParseWarnings("page.md") as warnings:
+            blocks = list(iter_numbered_blocks(md))
+        self.assertEqual(blocks, [(1, "Intro"), (3, "```\nx"), (6, "para"), (8, "- a")])
+        self.assertEqual([str(w) for w in warnings], [
+            "page.md:3: unclosed ``` code fence; the text after it is parsed as ordinary blocks",
+        ])
+
+    def test_unclosed_fence_later_blocks_render(self):
+        node = markdown_to_html_node("```\nx\n\n## Heading\n\n- a")
+        self.assertEqual(node.to_html(), "<div><p>` x</p><h2>Heading</h2><ul><li>a</li></ul></div>")
+
+    def test_string_blocks_are_numbered_as_consumed(self):
+        metadata = PageMetadata()
+        with ParseWarnings("page.md") as warnings:
+            blocks = iter_numbered_blocks("Intro\n\n```\nx\n\npara", metadata)
+            self.assertEqual(next(blocks), (1, "Intro"))
+            self.assertEqual((len(warnings), metadata.blocks), (0, 0))
+            self.assertEqual(list(blocks), [(3, "```\nx"), (6, "para")])
+        self.assertEqual((len(warnings), metadata.blocks), (1, 3))
+
+    def test_numbered_blocks_start_lines(self):
+        md = "\n# Title\n\n\n```\na\n\nb\n```\nafter\n\nlast"
+        self.assertEqual(list(iter_numbered_blocks(md)), [
+            (2, "# Title"),
+            (5, "```\na\n\nb\n```\nafter"),
+            (12, "last"),
+        ])
+
+    def test_metadata_title_matches_extract_title(self):
+        for md in ["# Hello", "#   Hello World   ", "Some text\n# My Title\nMore",
+                   "## Not this\n\n# The title\n\n# Second", "```\n# in code\n```\n\n# Real"]:
+            with self.subTest(md=md):
+                metadata = PageMetadata()
+                list(iter_numbered_blocks(md, metadata))
+                self.assertEqual(metadata.require_title(), extract_title(md))
+
+    def test_metadata_counts(self):
+        metadata = PageMetadata()
+        markdown_to_html_node("intro\n\n# Title\n\n- a\n- b\n", metadata=metadata)
+        self.assertEqual((metadata.title, metadata.title_line), ("Title", 3))
+        self.assertEqual((metadata.lines, metadata.blocks), (6, 3))
+
+    def test_missing_title_raises_like_extract_title(self):
+        metadata = PageMetadata()
+        list(iter_numbered_blocks("## Only h2", metadata))
+        with self.assertRaises(Exception) as context:
+            metadata.require_title()
+        self.assertEqual(str(context.exception), "No h1 header found in markdown")
+
+    def test_string_and_file_blocks_agree(self):
+        """The split of a string matches the line-by-line scan of a file"""
+        for md in ["\n\n\n# T\n\n\n\nA\r\nB\r\n  \r\nC", "  \n \t\n  x\n\n\n\ny\n",
+                   "a\n```\nb\n\nc\n```", "```\nx\n  \n```\nafter\n\n```one```\n\nz",
+                   "p\n\n```\nnever closed\n\n# Heading\n\n- a", "", "\n\n",
+                   "# T\n\n```\ncode```\n\nSome **text** here\n\n```\nmore\n```",
+                   "```\na\n\nb```\n  ", "```\na\n\nb```"]:
+            with self.subTest(md=md):
+                with ParseWarnings("page.md") as from_string:
+                    string_metadata = PageMetadata()
+                    blocks = list(iter_numbered_blocks(md, string_metadata))
+                with ParseWarnings("page.md") as from_file:
+                    file_metadata = PageMetadata()
+                    expected = list(iter_numbered_blocks(io.StringIO(md), file_metadata))
+                self.assertEqual(blocks, expected)
+                self.assertEqual(list(iter_blocks(md)), [block for _, block in expected])
+                self.assertEqual(vars(string_metadata), vars(file_metadata))
+                self.assertEqual([str(w) for w in from_string], [str(w) for w in from_file])
+
+    def test_file_object_renders_like_string(self):
+        md = "# Title\n\nSome **bold** text\n\n```\ncode\n\nmore\n```\n"
+        self.assertEqual(markdown_to_html_node(io.StringIO(md)).to_html(),
+                         markdown_to_html_node(md).to_html())
+        self.assertIn("<pre><code>code\n\nmore\n</code></pre>", markdown_to_html_node(md).to_html())
+
+    def test_markdown_to_blocks_uses_scanner(self):
+        self.assertEqual(markdown_to_blocks("```\na\n\nb\n```"), ["```\na\n\nb\n```"])
+
+
+if __name__ == "__main__":
+    unittest.main()
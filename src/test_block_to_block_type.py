@@ -1,5 +1,5 @@
 import unittest
-from block_to_block_type import BlockType, block_to_block_type
+from block_to_block_type import BlockType, block_to_block_type, classify_block
 
 
 class TestBlockToBlockType(unittest.TestCase):
@@ -232,5 +232,42 @@ class TestBlockToBlockType(unittest.TestCase):
         self.assertEqual(result, BlockType.PARAGRAPH)
 
 
+
+class TestClassifyBlock(unittest.TestCase):
+    
+    def test_heading_text_and_level(self):
+        classified = classify_block("### Some **bold** title")
+        self.assertEqual(classified.block_type, BlockType.HEADING)
+        self.assertEqual(classified.lines, ["Some **bold** title"])
+        self.assertEqual(classified.level, 3)
+    
+    def test_code_lines_inside_fences(self):
+        classified = classify_block("```python\nx = 1\n\ny = 2\n```")
+        self.assertEqual(classified.lines, ["x = 1", "", "y = 2"])
+    
+    def test_prefixes_are_stripped(self):
+        cases = [
+            ("> one\n>two", BlockType.QUOTE, ["one", "two"]),
+            ("- one\n- two", BlockType.UNORDERED_LIST, ["one", "two"]),
+            ("1. one\n2. two. too", BlockType.ORDERED_LIST, ["one", "two. too"]),
+            ("plain\ntext", BlockType.PARAGRAPH, ["plain", "text"]),
+        ]
+        for block, block_type, lines in cases:
+            with self.subTest(block=block):
+                classified = classify_block(block)
+                self.assertEqual(classified.block_type, block_type)
+                self.assertEqual(classified.lines, lines)
+    
+    def test_broken_list_is_paragraph_with_original_lines(self):
+        classified = classify_block("1. one\n3. three")
+        self.assertEqual(classified.block_type, BlockType.PARAGRAPH)
+        self.assertEqual(classified.lines, ["1. one", "3. three"])
+    
+    def test_matches_block_to_block_type(self):
+        for block in ["####### seven", "#nospace", "```\ncode```", "```", "- a\nb", "", "1. a\n2.b"]:
+            with self.subTest(block=block):
+                self.assertEqual(classify_block(block).block_type, block_to_block_type(block))
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
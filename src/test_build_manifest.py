@@ -0,0 +1,115 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from build_manifest import BuildManifest
+from generate_page import generate_page
+from test_support import write_file
+
+
+class TestBuildManifest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        self.manifest_path = os.path.join(self.dir, "manifest.json")
+        self.static = os.path.join(self.dir, "static")
+        self.asset = os.path.join(self.static, "images", "a.png")
+        self.source = os.path.join(self.dir, "index.md")
+        self.template = os.path.join(self.dir, "template.html")
+        self.dest = os.path.join(self.dir, "out", "index.html")
+        write_file(self.source, "# Title\n\nSome **bold** text ![a](/images/a.png)")
+        write_file(self.asset, "png")
+        write_file(self.template, "<title>{{ Title }}</title>{{ Content }}")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _build(self, basepath="/"):
+        manifest = BuildManifest(self.manifest_path, self.static)
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_page(self.source, self.template, self.dest, basepath, manifest)
+        manifest.save()
+        return manifest
+
+    def test_first_build_generates_page(self):
+        manifest = self._build()
+        self.assertEqual((manifest.rebuilt, manifest.skipped), (1, 0))
+        self.assertTrue(os.path.exists(self.dest))
+
+    def test_unchanged_inputs_are_skipped(self):
+        self._build()
+        manifest = self._build()
+        self.assertEqual((manifest.rebuilt, manifest.skipped), (0, 1))
+
+    def test_source_change_triggers_rebuild(self):
+        self._build()
+        write_file(self.source, "# Title\n\nDifferent text")
+        manifest = self._build()
+        self.assertEqual(manifest.rebuilt, 1)
+
+    def test_template_change_triggers_rebuild(self):
+        self._build()
+        write_file(self.template, "<h1>{{ Title }}</h1>{{ Content }}")
+        manifest = self._build()
+        self.assertEqual(manifest.rebuilt, 1)
+
+    def test_basepath_change_triggers_rebuild(self):
+        self._build()
+        manifest = self._build("/site/")
+        self.assertEqual(manifest.rebuilt, 1)
+
+    def test_missing_output_triggers_rebuild(self):
+        self._build()
+        os.remove(self.dest)
+        manifest = self._build()
+        self.assertEqual(manifest.rebuilt, 1)
+        self.assertTrue(os.path.exists(self.dest))
+
+    def test_referenced_asset_is_recorded(self):
+        manifest = self._build()
+        self.assertEqual(list(manifest.entries[self.dest]["assets"]), [self.asset])
+
+    def test_asset_change_triggers_rebuild(self):
+        self._build()
+        write_file(self.asset, "new png")
+        manifest = self._build()
+        self.assertEqual(manifest.rebuilt, 1)
+
+    def test_explain_rebuild_reasons(self):
+        self._build()
+        manifest = BuildManifest(self.manifest_path, self.static)
+        fingerprint = manifest.fingerprint(self.source, "# Other", self.template, "/site/")
+        self.assertEqual(manifest.explain_rebuild(self.dest, fingerprint), [
+            f"source changed ({self.source})",
+            "basepath changed (/ -> /site/)",
+        ])
+        self.assertEqual(manifest.explain_rebuild("docs/new.html", fingerprint), ["new page"])
+
+    def test_unseen_outputs_are_pruned_on_save(self):
+        self._build()
+        manifest = BuildManifest(self.manifest_path)
+        manifest.save()
+        self.assertEqual(BuildManifest(self.manifest_path).entries, {})
+
+    def test_entries_are_relative_to_output_dir(self):
+        """Test that a page matches whichever output directory it was built into"""
+        live = os.path.join(self.dir, "docs")
+        staging = os.path.join(self.dir, "staging")
+        for output_dir in (live, staging):
+            manifest = BuildManifest(self.manifest_path, self.static, output_dir)
+            dest = os.path.join(output_dir, "index.html")
+            if output_dir == staging:
+                os.makedirs(staging)
+                os.link(os.path.join(live, "index.html"), dest)
+            with contextlib.redirect_stdout(io.StringIO()):
+                generate_page(self.source, self.template, dest, "/", manifest)
+            manifest.save()
+        self.assertEqual((manifest.rebuilt, manifest.skipped), (0, 1))
+        self.assertEqual(list(manifest.entries), ["index.html"])
+        self.assertEqual(manifest.stale_outputs(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
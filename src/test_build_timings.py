@@ -0,0 +1,127 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from build_timings import BuildTimings, PHASES, current_page
+from block_cache import BlockCache
+from generate_page import generate_page
+from markdown_to_html_node import markdown_to_html_node
+
+
+class TestBuildTimings(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmp.name, "index.md")
+        self.template = os.path.join(self.tmp.name, "template.html")
+        self.dest = os.path.join(self.tmp.name, "index.html")
+        with open(self.source, 'w') as f:
+            f.write("# Title\n\nSome **bold** text\n\n- a\n- b")
+        with open(self.template, 'w') as f:
+            f.write("<title>{{ Title }}</title>{{ Content }}")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _generate(self, timings):
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_page(self.source, self.template, self.dest, timings=timings)
+
+    def test_page_phases_are_recorded(self):
+        timings = BuildTimings()
+        self._generate(timings)
+        self.assertEqual(len(timings.pages), 1)
+        phases = timings.pages[0].phases
+        for phase in ("read", "markdown_to_blocks", "block_to_block_type",
+                      "inline_parsing", "to_html", "template", "write"):
+            with self.subTest(phase=phase):
+                self.assertIn(phase, phases)
+        self.assertIsNone(current_page())
+
+    def test_block_cache_rendering_is_charged_to_to_html(self):
+        timings = BuildTimings()
+        page = timings.start_page("index.html")
+        markdown_to_html_node("Some **bold** text", BlockCache())
+        timings.finish_page(page)
+        self.assertIn("to_html", page.phases)
+
+        timings = BuildTimings()
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_page(self.source, self.template, self.dest, timings=timings,
+                          block_cache=BlockCache())
+        for phase, seconds in timings.pages[0].phases.items():
+            with self.subTest(phase=phase):
+                self.assertGreaterEqual(seconds, 0)
+
+    def test_inline_fast_path_is_counted(self):
+        timings = BuildTimings()
+        self._generate(timings)
+        # "Title", "a" and "b" have no markup; "Some **bold** text" does
+        self.assertEqual(timings.counts, {"inline_texts": 4, "inline_fast_path": 3})
+        self.assertIn("3/4", timings.report())
+        self.assertEqual(timings.to_dict()["counts"]["inline_fast_path"], 3)
+
+    def test_totals_match_pages(self):
+        timings = BuildTimings()
+        self._generate(timings)
+        self._generate(timings)
+        self.assertAlmostEqual(timings.total(), sum(page.total() for page in timings.pages))
+
+    def test_merge(self):
+        first, second = BuildTimings(), BuildTimings()
+        self._generate(first)
+        self._generate(second)
+        first.merge(second)
+        self.assertEqual(len(first.pages), 2)
+
+    def test_report_and_json(self):
+        timings = BuildTimings()
+        timings.add("static_copy", 0.5)
+        self._generate(timings)
+        report = timings.report(slowest=1)
+        for _, label in PHASES:
+            self.assertIn(label, report)
+        self.assertIn("Slowest 1 of 1 pages", report)
+
+        path = os.path.join(self.tmp.name, "timings.json")
+        timings.write_json(path)
+        with open(path, 'r') as f:
+            data = json.load(f)
+        self.assertEqual(data["phases"]["static_copy"], 0.5)
+        self.assertEqual(data["slowest"], [self.dest])
+
+    def test_trace_events(self):
+        timings = BuildTimings(trace=True)
+        self._generate(timings)
+        names = [event["name"] for event in timings.events]
+        for name in ("generate_page", "read", "parse (markdown_to_html_node)",
+                     "render (to_html)", "template", "write"):
+            with self.subTest(name=name):
+                self.assertIn(name, names)
+        # Rendering and substitution are one span each per page, however
+        # many blocks the page has
+        self.assertEqual(names.count("render (to_html)"), 1)
+        self.assertEqual(names.count("template"), 1)
+        for event in timings.events:
+            self.assertEqual(event["ph"], "X")
+            self.assertEqual(event["tid"], os.getpid())
+            self.assertEqual(event["args"]["worker"], os.getpid())
+            self.assertGreaterEqual(event["dur"], 0)
+
+        path = os.path.join(self.tmp.name, "trace.json")
+        timings.write_trace(path)
+        with open(path, 'r') as f:
+            data = json.load(f)
+        self.assertIn({"name": "thread_name", "ph": "M", "pid": 1, "tid": os.getpid(),
+                       "args": {"name": "main"}}, data["traceEvents"])
+
+    def test_no_trace_events_by_default(self):
+        timings = BuildTimings()
+        self._generate(timings)
+        self.assertIsNone(timings.events)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import io
+import unittest
+from build_timings import PageTimings
+from compiled_template import CompiledTemplate, rewrite_root_urls
+from leafnode import LeafNode
+from markdown_to_html_node import markdown_to_html_node
+
+
+TEMPLATE = """<html>
+<head><title>{{ Title }}</title><link href="/index.css" rel="stylesheet" /></head>
+<body><article>{{ Content }}</article></body>
+</html>"""
+
+
+def replace_render(template, title, content, basepath):
+    """The original chain of replace() calls the compiled template stands in for"""
+    html = template.replace("{{ Title }}", title).replace("{{ Content }}", content)
+    html = html.replace('href="/', f'href="{basepath}')
+    return html.replace('src="/', f'src="{basepath}')
+
+
+def render(template, title, content):
+    """Write a page whose content is already rendered HTML to a string"""
+    out = io.StringIO()
+    template.write_to(out, title, LeafNode(None, content))
+    return out.getvalue()
+
+
+class TestCompiledTemplate(unittest.TestCase):
+
+    def test_render_default_basepath(self):
+        template = CompiledTemplate(TEMPLATE)
+        content = '<p><a href="/blog">blog</a><img src="/a.png" alt="a"></img></p>'
+        self.assertEqual(
+            render(template, "Home", content),
+            replace_render(TEMPLATE, "Home", content, "/"),
+        )
+
+    def test_render_custom_basepath(self):
+        template = CompiledTemplate(TEMPLATE, "/site/")
+        content = '<p><a href="/blog">blog</a><img src="/a.png" alt="a"></img></p>'
+        result = render(template, "Home", content)
+        self.assertEqual(result, replace_render(TEMPLATE, "Home", content, "/site/"))
+        self.assertIn('href="/site/index.css"', result)
+        self.assertIn('href="/site/blog"', result)
+        self.assertIn('src="/site/a.png"', result)
+
+    def test_repeated_placeholders(self):
+        source = "{{ Title }}|{{ Title }}|{{ Content }}"
+        template = CompiledTemplate(source)
+        self.assertEqual(render(template, "T", "C"), "T|T|C")
+
+    def test_template_without_placeholders(self):
+        template = CompiledTemplate("<p>static</p>")
+        self.assertEqual(render(template, "T", "C"), "<p>static</p>")
+
+    def test_write_to_streams_same_page_as_replace(self):
+        node = markdown_to_html_node("# Title\n\n[home](/) and ![img](/a.png)\n\n- [x](https://e.com)")
+        for basepath in ("/", "/site/"):
+            with self.subTest(basepath=basepath):
+                template = CompiledTemplate(TEMPLATE + "{{ Content }}", basepath)
+                out = io.StringIO()
+                template.write_to(out, "Title", node)
+                self.assertEqual(out.getvalue(), replace_render(TEMPLATE + "{{ Content }}", "Title",
+                                                                node.to_html(), basepath))
+
+    def test_timed_write_to_records_phases(self):
+        node = markdown_to_html_node("# Title\n\n[home](/) and ![img](/a.png)")
+        template = CompiledTemplate(TEMPLATE + "{{ Content }}", "/site/")
+        timings = PageTimings("page.html")
+        out = io.StringIO()
+        template.write_to(out, "Title", node, timings)
+        self.assertEqual(out.getvalue(), replace_render(TEMPLATE + "{{ Content }}", "Title",
+                                                        node.to_html(), "/site/"))
+        self.assertEqual(sorted(timings.phases), ["template", "to_html"])
+
+    def test_rewrite_root_urls_leaves_absolute_urls(self):
+        html = '<a href="https://example.com">x</a><a href="/x">y</a>'
+        self.assertEqual(
+            rewrite_root_urls(html, "/site/"),
+            '<a href="https://example.com">x</a><a href="/site/x">y</a>',
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+from dependency_graph import DependencyGraph
+
+
+class TestDependencyGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = DependencyGraph.from_manifest_entries({
+            "docs/index.html": {
+                "source_path": "content/index.md",
+                "template_path": "template.html",
+                "assets": {"static/images/a.png": "1:1"},
+            },
+            "docs/blog/index.html": {
+                "source_path": "content/blog/index.md",
+                "template_path": "template.html",
+                "assets": {},
+            },
+        })
+
+    def test_source_change_affects_one_page(self):
+        self.assertEqual(
+            self.graph.stale_outputs(["content/blog/index.md"]),
+            {"docs/blog/index.html": ["content/blog/index.md"]},
+        )
+
+    def test_asset_change_affects_referencing_pages(self):
+        self.assertEqual(
+            self.graph.stale_outputs(["static/images/a.png"]),
+            {"docs/index.html": ["static/images/a.png"]},
+        )
+
+    def test_template_affects_every_page(self):
+        self.assertEqual(
+            sorted(self.graph.stale_outputs(["template.html"])),
+            ["docs/blog/index.html", "docs/index.html"],
+        )
+
+    def test_reasons_list_every_changed_input(self):
+        stale = self.graph.stale_outputs(["template.html", "content/index.md"])
+        self.assertEqual(stale["docs/index.html"], ["content/index.md", "template.html"])
+
+    def test_unrelated_change(self):
+        self.assertEqual(self.graph.stale_outputs(["static/index.css"]), {})
+
+    def test_remove_output(self):
+        self.graph.remove("docs/index.html")
+        self.assertEqual(self.graph.stale_outputs(["static/images/a.png"]), {})
+        self.assertNotIn("content/index.md", self.graph.dependents)
+
+    def test_add_replaces_previous_inputs(self):
+        self.graph.add("docs/index.html", ["content/other.md"])
+        self.assertEqual(self.graph.stale_outputs(["content/index.md"]), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
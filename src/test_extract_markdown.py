@@ -1,5 +1,6 @@
 import unittest
-from extract_markdown import extract_markdown_images, extract_markdown_links
+from unittest import mock
+from extract_markdown import LinkScanner, extract_markdown_images, extract_markdown_links
 
 
 class TestExtractMarkdown(unittest.TestCase):
@@ -118,29 +119,47 @@ class TestExtractMarkdown(unittest.TestCase):
         self.assertListEqual(images, expected_images)
         self.assertListEqual(links, expected_links)
     
-    def test_nested_brackets_not_captured(self):
-        """Test that nested brackets are handled correctly (should not match)"""
-        # These should not be captured because they have nested brackets
-        text = "Invalid: ![nested [brackets]](url) and [nested [brackets]](url)"
+    def test_nested_brackets_captured(self):
+        """Test that balanced nested brackets are part of the alt/anchor text"""
+        text = "Nested: ![nested [brackets]](url) and [nested [brackets]](url)"
         
         images = extract_markdown_images(text)
         links = extract_markdown_links(text)
         
-        # Should not match due to nested brackets
-        self.assertListEqual(images, [])
-        self.assertListEqual(links, [])
+        self.assertListEqual(images, [("nested [brackets]", "url")])
+        self.assertListEqual(links, [("nested [brackets]", "url")])
     
-    def test_nested_parentheses_not_captured(self):
-        """Test that nested parentheses are handled correctly (should not match)"""
-        # These should not be captured because they have nested parentheses
-        text = "Invalid: ![alt](url(with)parens) and [anchor](url(with)parens)"
+    def test_nested_parentheses_captured(self):
+        """Test that balanced nested parentheses are part of the URL"""
+        text = "Nested: ![alt](url(with)parens) and [Foo](https://en.wikipedia.org/wiki/Foo_(bar))"
         
         images = extract_markdown_images(text)
         links = extract_markdown_links(text)
         
-        # Should not match due to nested parentheses
-        self.assertListEqual(images, [])
-        self.assertListEqual(links, [])
+        self.assertListEqual(images, [("alt", "url(with)parens")])
+        self.assertListEqual(links, [("Foo", "https://en.wikipedia.org/wiki/Foo_(bar)")])
+    
+    def test_unbalanced_brackets_not_captured(self):
+        """Test that unbalanced brackets and parentheses do not match"""
+        text = "Broken: [a [b](url and ![c](d(e) and [x]] (y)"
+        
+        self.assertListEqual(extract_markdown_images(text), [])
+        self.assertListEqual(extract_markdown_links(text), [])
+    
+    def test_adversarial_input_is_linear(self):
+        """Test that pathological unclosed brackets are each examined once"""
+        text = "[" * 20000 + "](" * 20000 + "![" * 20000
+        
+        with mock.patch.object(LinkScanner, "_match_brackets", autospec=True,
+                               side_effect=LinkScanner._match_brackets) as match:
+            self.assertListEqual(extract_markdown_links(text), [])
+            links_checked = match.call_count
+            self.assertListEqual(extract_markdown_images(text), [])
+        
+        # One bracket lookup per [ or ![; a rescanning finder would make one
+        # per pair of brackets
+        self.assertLessEqual(links_checked, text.count("["))
+        self.assertLessEqual(match.call_count - links_checked, text.count("!["))
     
     def test_multiple_same_type(self):
         """Test multiple instances of same type"""
@@ -0,0 +1,89 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from block_cache import BlockCache
+from generate_page import collect_pages, generate_pages_recursive, stream_file_atomic
+from test_support import write_file
+
+
+class TestGeneratePages(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        self.content = os.path.join(self.dir, "content")
+        self.template = os.path.join(self.dir, "template.html")
+        write_file(self.template, '<title>{{ Title }}</title><link href="/index.css">{{ Content }}')
+        write_file(os.path.join(self.content, "index.md"), "# Home\n\n![img](/images/a.png)")
+        write_file(os.path.join(self.content, "blog", "a", "index.md"), "# A\n\n- one\n- two")
+        write_file(os.path.join(self.content, "blog", "b", "index.md"), "# B\n\n" + "Long _text_. " * 200)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _read_tree(self, root):
+        files = {}
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                with open(path, 'rb') as f:
+                    files[os.path.relpath(path, root)] = f.read()
+        return files
+
+    def test_collect_pages(self):
+        dest = os.path.join(self.dir, "docs")
+        pages = sorted(collect_pages(self.content, dest))
+        self.assertEqual(pages, [
+            (os.path.join(self.content, "blog", "a", "index.md"),
+             os.path.join(dest, "blog", "a", "index.html")),
+            (os.path.join(self.content, "blog", "b", "index.md"),
+             os.path.join(dest, "blog", "b", "index.html")),
+            (os.path.join(self.content, "index.md"),
+             os.path.join(dest, "index.html")),
+        ])
+
+    def test_parallel_output_matches_serial(self):
+        serial = os.path.join(self.dir, "serial")
+        parallel = os.path.join(self.dir, "parallel")
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages_recursive(self.content, self.template, serial, "/site/")
+            generate_pages_recursive(self.content, self.template, parallel, "/site/", jobs=2)
+        self.assertEqual(self._read_tree(serial), self._read_tree(parallel))
+        self.assertEqual(len(self._read_tree(serial)), 3)
+
+    def test_failed_stream_keeps_old_file(self):
+        path = os.path.join(self.dir, "page.html")
+        write_file(path, "old")
+        def fail(f):
+            f.write("partial")
+            raise RuntimeError("render failed")
+        with self.assertRaises(RuntimeError):
+            stream_file_atomic(path, fail)
+        self.assertEqual(self._read_tree(self.dir)["page.html"], b"old")
+        self.assertFalse([name for name in os.listdir(self.dir) if ".tmp" in name])
+
+    def test_failed_stream_raises_original_error_without_temp_file(self):
+        path = os.path.join(self.dir, "page.html")
+        def fail(f):
+            os.remove(f.name)
+            raise RuntimeError("render failed")
+        with self.assertRaisesRegex(RuntimeError, "render failed"):
+            stream_file_atomic(path, fail)
+        self.assertFalse(os.path.exists(path))
+
+    def test_parallel_workers_share_block_cache(self):
+        plain = os.path.join(self.dir, "plain")
+        cached = os.path.join(self.dir, "cached")
+        cache = BlockCache()
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages_recursive(self.content, self.template, plain, "/site/")
+            generate_pages_recursive(self.content, self.template, cached, "/site/", jobs=2, block_cache=cache)
+        self.assertEqual(self._read_tree(plain), self._read_tree(cached))
+        self.assertEqual(cache.misses, 6)
+        self.assertEqual(len(cache), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,7 @@
 import unittest
 from htmlnode import HTMLNode
+from leafnode import LeafNode
+from parentnode import ParentNode
 
 class TestHTMLNode(unittest.TestCase):
     def test_props_to_html_single_attribute(self):
@@ -30,4 +32,12 @@ class TestHTMLNode(unittest.TestCase):
         node = HTMLNode(tag="p", value="Just text")
         self.assertEqual(node.props_to_html(), "")
 
+    def test_nodes_have_no_instance_dict(self):
+        leaf = LeafNode("b", "bold")
+        nodes = [HTMLNode("p", "text"), leaf, ParentNode("p", [leaf])]
+        for node in nodes:
+            with self.subTest(node=type(node).__name__):
+                self.assertFalse(hasattr(node, "__dict__"))
+        self.assertEqual(repr(leaf), "HTMLNode(b, bold, None, None)")
+
                     
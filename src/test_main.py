@@ -0,0 +1,90 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+import main
+from test_support import read_file, write_file
+
+
+class TestMain(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        # main builds content/ and static/ into docs/ in the working directory
+        os.chdir(self.tmp.name)
+        write_file(os.path.join("content", "index.md"), "# Home\n\n![a](/images/a.png)")
+        write_file(os.path.join("content", "blog", "index.md"), "# Blog")
+        write_file(os.path.join("static", "images", "a.png"), "png")
+        write_file("template.html", "<title>{{ Title }}</title>{{ Content }}")
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def _run(self, *argv):
+        output = io.StringIO()
+        with mock.patch("sys.argv", ["main.py", *argv]), contextlib.redirect_stdout(output):
+            main.main()
+        return output.getvalue()
+
+    def _pages(self, root):
+        return sorted(os.path.relpath(os.path.join(dirpath, name), root)
+                      for dirpath, _, names in os.walk(root)
+                      for name in names if name.endswith(".html"))
+
+    def test_atomic_build_after_plain_build_keeps_pages(self):
+        pages = [os.path.join("blog", "index.html"), "index.html"]
+        self._run()
+        self.assertEqual(self._pages("docs"), pages)
+
+        output = self._run("--atomic")
+        self.assertNotIn("Removing page", output)
+        self.assertIn("skipped 2 unchanged pages", output)
+        self.assertTrue(os.path.islink("docs"))
+        self.assertEqual(self._pages("docs"), pages)
+        # The plain build was moved aside intact
+        self.assertEqual(self._pages(os.path.join(main.BUILDS_DIR, "build-0")), pages)
+
+        self._run("--rollback")
+        self.assertEqual(self._pages("docs"), pages)
+
+    def test_deleted_source_is_removed_from_staged_build_only(self):
+        self._run("--atomic")
+        live = os.path.realpath("docs")
+        os.remove(os.path.join("content", "blog", "index.md"))
+        output = self._run("--atomic")
+        self.assertIn("Removing page with deleted source: .docs-builds/staging/blog/index.html", output)
+        self.assertEqual(self._pages("docs"), ["index.html"])
+        self.assertEqual(self._pages(live), [os.path.join("blog", "index.html"), "index.html"])
+
+    def test_failed_publish_keeps_manifest_of_live_build(self):
+        self._run("--atomic")
+        write_file(os.path.join("content", "index.md"), "# Home\n\nChanged text")
+        with mock.patch.object(main.BlockCache, "save", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                self._run("--atomic", "--block-cache-size", "16", "--block-cache-file", "blocks.json")
+        self.assertNotIn("Changed text", read_file(os.path.join("docs", "index.html")))
+
+        self._run("--atomic")
+        self.assertIn("Changed text", read_file(os.path.join("docs", "index.html")))
+
+    def test_jobs_below_one_is_rejected(self):
+        for jobs in ("0", "-2"):
+            with self.subTest(jobs=jobs):
+                with contextlib.redirect_stderr(io.StringIO()) as errors, self.assertRaises(SystemExit):
+                    main.parse_args(["--jobs", jobs])
+                self.assertIn("--jobs must be at least 1", errors.getvalue())
+
+    def test_clean_after_atomic_build(self):
+        self._run("--atomic")
+        self._run("--clean")
+        self.assertFalse(os.path.islink("docs"))
+        self.assertFalse(os.path.exists(main.BUILDS_DIR))
+        self.assertEqual(self._pages("docs"), [os.path.join("blog", "index.html"), "index.html"])
+
+
+if __name__ == "__main__":
+    unittest.main()
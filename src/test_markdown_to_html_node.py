@@ -259,6 +259,27 @@ def example():
         
         # Second child should be p
         self.assertEqual(node.children[1].tag, "p")
+    
+    def test_plain_text_is_single_leaf(self):
+        """Test that text without markup characters becomes one plain leaf"""
+        node = markdown_to_html_node("Just some plain text,\nover two lines.")
+        paragraph = node.children[0]
+        self.assertEqual(len(paragraph.children), 1)
+        self.assertIsNone(paragraph.children[0].tag)
+        self.assertEqual(paragraph.children[0].value, "Just some plain text, over two lines.")
+    
+    def test_inline_content_is_rendered_directly(self):
+        """Test that formatted text becomes one raw HTML node keeping its URLs"""
+        from block_cache import collect_root_urls
+        node = markdown_to_html_node("See [home](/index.html) and ![logo](/images/logo.png) **now**")
+        paragraph = node.children[0]
+        self.assertEqual(len(paragraph.children), 1)
+        self.assertEqual(
+            paragraph.to_html(),
+            '<p>See <a href="/index.html">home</a> and '
+            '<img src="/images/logo.png" alt="logo"></img> <b>now</b></p>'
+        )
+        self.assertEqual(sorted(collect_root_urls(node)), ["/images/logo.png", "/index.html"])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,119 @@
+import io
+import pickle
+import unittest
+from block_cache import BlockCache, collect_root_urls
+from leafnode import LeafNode
+from markdown_to_html_node import markdown_to_html_node
+from node_arena import NodeArena
+from parentnode import ParentNode
+from rawhtmlnode import RawHTMLNode
+from text_node_to_html_node import text_node_to_html_node
+from text_to_textnodes import text_to_textnodes
+
+
+MARKDOWN = """# Title
+
+A paragraph with **bold**, a [link](/blog/post) and ![an image](/images/a.png).
+
+- one
+- two
+
+```
+code
+```
+"""
+
+
+class TestNodeArena(unittest.TestCase):
+
+    def test_renders_like_the_tree(self):
+        node = markdown_to_html_node(MARKDOWN)
+        arena = NodeArena.from_node(node)
+        self.assertEqual(arena.to_html(), node.to_html())
+
+    def test_round_trip_per_span_tree(self):
+        """Test a tree with tagged leaves, props and nesting survives the round trip"""
+        spans = [text_node_to_html_node(n) for n in text_to_textnodes("x **b** [l](/u) ![i](/p.png)")]
+        node = ParentNode("div", [ParentNode("p", spans, {"class": "intro"})])
+        rebuilt = NodeArena.from_node(node).to_node()
+        self.assertEqual(rebuilt.to_html(), node.to_html())
+        paragraph = rebuilt.children[0]
+        self.assertEqual(paragraph.props, {"class": "intro"})
+        self.assertIsInstance(paragraph.children[1], LeafNode)
+        self.assertEqual(paragraph.children[1].tag, "b")
+        self.assertEqual(paragraph.children[5].props, {"src": "/p.png", "alt": "i"})
+
+    def test_raw_nodes_keep_their_urls(self):
+        """Test that cached blocks come back as raw HTML with their URLs"""
+        cache = BlockCache()
+        markdown_to_html_node(MARKDOWN, cache)
+        node = markdown_to_html_node(MARKDOWN, cache)
+        arena = NodeArena.from_node(node)
+        self.assertEqual(arena.to_html(), node.to_html())
+        self.assertEqual(sorted(arena.root_urls()), sorted(collect_root_urls(node)))
+        rebuilt = arena.to_node()
+        self.assertIsInstance(rebuilt.children[0], RawHTMLNode)
+        self.assertEqual(sorted(collect_root_urls(rebuilt)), ["/blog/post", "/images/a.png"])
+
+    def test_root_urls_from_attributes(self):
+        node = ParentNode("p", [
+            LeafNode("a", "home", {"href": "/index.html"}),
+            LeafNode("a", "out", {"href": "https://example.com"}),
+            LeafNode("img", "", {"src": "/logo.png", "alt": "logo"}),
+        ])
+        self.assertEqual(NodeArena.from_node(node).root_urls(), ["/index.html", "/logo.png"])
+
+    def test_strings_are_stored_once(self):
+        node = ParentNode("ul", [ParentNode("li", [LeafNode(None, "same")]) for _ in range(100)])
+        arena = NodeArena.from_node(node)
+        self.assertEqual(sorted(arena.strings), ["li", "same", "ul"])
+
+    def test_chunks_are_one_per_child(self):
+        node = ParentNode("div", [
+            ParentNode("p", [LeafNode(None, "a")]),
+            LeafNode("h1", "b", {"id": "b"}),
+            LeafNode(None, "c"),
+        ], {"class": "page", "id": "top"})
+        chunks = list(NodeArena.from_node(node).to_html_iter())
+        self.assertEqual(chunks, ['<div class="page" id="top">', "<p>a</p>", '<h1 id="b">b</h1>', "c", "</div>"])
+
+    def test_write_to(self):
+        node = markdown_to_html_node(MARKDOWN)
+        out = io.StringIO()
+        NodeArena.from_node(node).write_to(out)
+        self.assertEqual(out.getvalue(), node.to_html())
+
+    def test_deep_tree(self):
+        """Test that trees deeper than the recursion limit are handled"""
+        node = LeafNode(None, "leaf")
+        for _ in range(5000):
+            node = ParentNode("div", [node])
+        arena = NodeArena.from_node(node)
+        self.assertEqual(arena.to_html(), node.to_html())
+        self.assertEqual(arena.to_node().to_html(), node.to_html())
+
+    def test_pickle(self):
+        arena = NodeArena.from_node(markdown_to_html_node(MARKDOWN))
+        restored = pickle.loads(pickle.dumps(arena))
+        self.assertEqual(restored.to_html(), arena.to_html())
+
+    def test_invalid_nodes_raise(self):
+        with self.assertRaises(ValueError) as context:
+            NodeArena.from_node(ParentNode(None, []))
+        self.assertEqual(str(context.exception), "ParentNode must have a tag")
+        with self.assertRaises(ValueError) as context:
+            NodeArena.from_node(ParentNode("p", None))
+        self.assertEqual(str(context.exception), "ParentNode must have children")
+        with self.assertRaises(ValueError) as context:
+            NodeArena.from_node(ParentNode("p", [LeafNode("b", None)]))
+        self.assertEqual(str(context.exception), "LeafNode must have a value")
+
+    def test_empty_arena(self):
+        arena = NodeArena()
+        self.assertEqual(len(arena), 0)
+        self.assertEqual(arena.to_html(), "")
+        self.assertIsNone(arena.to_node())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,9 @@
+import io
+import sys
 import unittest
 from htmlnode import HTMLNode
 from leafnode import LeafNode
-from parentnode import ParentNode
+from parentnode import MAX_RECURSION_DEPTH, ParentNode
 
 
 class TestParentNode(unittest.TestCase):
@@ -195,6 +197,54 @@ class TestParentNode(unittest.TestCase):
         self.assertIn('<strong>web development</strong>', result)
         self.assertIn('<code>Code example</code>', result)
         self.assertTrue(result.endswith('</ul></article>'))
+    
+    def test_deep_nesting_beyond_recursion_limit(self):
+        """Test that nesting deeper than the recursion limit still renders"""
+        depth = sys.getrecursionlimit() * 5
+        node = LeafNode("b", "deep")
+        for _ in range(depth):
+            node = ParentNode("div", [node])
+        self.assertEqual(node.to_html(), "<div>" * depth + "<b>deep</b>" + "</div>" * depth)
+    
+    def test_siblings_around_the_recursion_depth_switch(self):
+        """Test siblings before and after a subtree rendered with the stack"""
+        depth = MAX_RECURSION_DEPTH + 5
+        node = LeafNode(None, "x")
+        for i in range(depth):
+            node = ParentNode("div", [LeafNode("i", str(i)), node, LeafNode("b", str(i))],
+                              {"id": str(i)} if i % 2 else None)
+        expected = "x"
+        for i in range(depth):
+            opening = f'<div id="{i}">' if i % 2 else "<div>"
+            expected = f"{opening}<i>{i}</i>{expected}<b>{i}</b></div>"
+        self.assertEqual(node.to_html(), expected)
+    
+    def test_wide_tree_keeps_child_order(self):
+        """Test siblings after a nested child are rendered in order"""
+        items = [ParentNode("li", [LeafNode(None, str(i)), ParentNode("b", [LeafNode(None, "x")])])
+                 for i in range(10000)]
+        expected = "<ul>" + "".join(f"<li>{i}<b>x</b></li>" for i in range(10000)) + "</ul>"
+        self.assertEqual(ParentNode("ul", items).to_html(), expected)
+    
+    def test_to_html_iter_and_write_to(self):
+        """Test streaming yields one chunk per child and matches to_html"""
+        node = ParentNode("div", [
+            ParentNode("p", [LeafNode("b", "one")]),
+            ParentNode("ul", [ParentNode("li", [LeafNode(None, "two")])]),
+        ], {"class": "page"})
+        self.assertEqual(list(node.to_html_iter()), [
+            '<div class="page">', "<p><b>one</b></p>", "<ul><li>two</li></ul>", "</div>",
+        ])
+        out = io.StringIO()
+        node.write_to(out)
+        self.assertEqual(out.getvalue(), node.to_html())
+        self.assertEqual(list(LeafNode("i", "x").to_html_iter()), ["<i>x</i>"])
+    
+    def test_invalid_nested_child_raises(self):
+        """Test that an invalid parent deep in the tree still raises"""
+        node = ParentNode("div", [LeafNode("b", "ok"), ParentNode("p", None)])
+        with self.assertRaises(ValueError):
+            node.to_html()
 
 
 if __name__ == "__main__":
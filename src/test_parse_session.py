@@ -0,0 +1,80 @@
+import unittest
+from block_cache import BlockCache, collect_root_urls
+from block_scanner import PageMetadata
+from markdown_to_html_node import markdown_to_html_node
+from parse_session import ParseSession
+from parse_warnings import ParseWarnings
+
+
+DOCUMENT = "# Title\n\nFirst **bold** paragraph\n\n- one\n- two\n\n![img](/images/a.png)"
+
+
+class TestParseSession(unittest.TestCase):
+
+    def test_first_parse_matches_markdown_to_html_node(self):
+        session = ParseSession()
+        self.assertEqual(session.parse(DOCUMENT).to_html(), markdown_to_html_node(DOCUMENT).to_html())
+        self.assertEqual((session.reparsed, session.reused), (4, 0))
+
+    def test_edit_reparses_only_changed_block(self):
+        session = ParseSession()
+        session.parse(DOCUMENT)
+        edited = DOCUMENT.replace("First", "Edited")
+        html = session.parse(edited).to_html()
+        self.assertEqual(html, markdown_to_html_node(edited).to_html())
+        self.assertEqual((session.reparsed, session.reused), (5, 3))
+
+    def test_moved_and_removed_blocks(self):
+        session = ParseSession()
+        session.parse(DOCUMENT)
+        moved = "- one\n- two\n\n# Title"
+        self.assertEqual(session.parse(moved).to_html(), markdown_to_html_node(moved).to_html())
+        self.assertEqual(session.reparsed, 4)
+        # Blocks dropped from the document are forgotten after the next version
+        session.parse(moved)
+        self.assertEqual(len(session.current), 2)
+        self.assertEqual(len(session.previous), 2)
+
+    def test_begin_without_parse_keeps_blocks(self):
+        session = ParseSession()
+        session.parse(DOCUMENT)
+        session.begin()
+        session.begin()
+        session.parse(DOCUMENT)
+        self.assertEqual(session.reparsed, 4)
+
+    def test_asset_urls_and_metadata(self):
+        session = ParseSession()
+        session.parse(DOCUMENT)
+        metadata = PageMetadata()
+        node = session.parse(DOCUMENT, metadata)
+        self.assertEqual(collect_root_urls(node), ["/images/a.png"])
+        self.assertEqual(metadata.title, "Title")
+
+    def test_shared_block_cache(self):
+        cache = BlockCache()
+        markdown_to_html_node(DOCUMENT, cache)
+        session = ParseSession(cache)
+        session.parse(DOCUMENT + "\n\nNew block")
+        self.assertEqual((session.reused, session.reparsed), (4, 1))
+        self.assertEqual(len(cache), 5)
+
+    def test_changed_block_warns_with_its_line(self):
+        session = ParseSession()
+        session.parse(DOCUMENT)
+        with ParseWarnings("page.md") as warnings:
+            session.parse(DOCUMENT.replace("**bold**", "**bold"))
+        self.assertEqual([warning.line for warning in warnings], [3])
+
+    def test_reused_block_warns_again(self):
+        session = ParseSession()
+        broken = DOCUMENT.replace("**bold**", "**bold")
+        session.parse(broken)
+        with ParseWarnings("page.md") as warnings:
+            session.parse("# New title\n\n" + broken.split("\n\n", 1)[1])
+        self.assertEqual(session.reused, 3)
+        self.assertEqual([warning.line for warning in warnings], [3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 from textnode import TextNode, TextType
 from split_nodes_delimiter import split_nodes_delimiter
+from parse_warnings import ParseWarnings
 
 
 class TestSplitNodesDelimiter(unittest.TestCase):
@@ -165,24 +166,27 @@ class TestSplitNodesDelimiter(unittest.TestCase):
             self.assertEqual(result[i].text, expected_node.text)
             self.assertEqual(result[i].text_type, expected_node.text_type)
     
-    def test_unmatched_delimiter_raises_error(self):
-        """Test that unmatched delimiter raises ValueError"""
+    def test_unmatched_delimiter_is_literal(self):
+        """Test that an unmatched delimiter is kept as text and warned about"""
         node = TextNode("Unmatched **bold text", TextType.PLAIN)
         
-        with self.assertRaises(ValueError) as context:
-            split_nodes_delimiter([node], "**", TextType.BOLD)
+        with ParseWarnings("page.md") as warnings:
+            result = split_nodes_delimiter([node], "**", TextType.BOLD)
         
-        self.assertIn("Unmatched delimiter", str(context.exception))
-        self.assertIn("**", str(context.exception))
+        self.assertEqual(result, [TextNode("Unmatched **bold text", TextType.PLAIN)])
+        self.assertEqual(len(warnings), 1)
+        self.assertIn("unmatched '**'", str(list(warnings)[0]))
     
     def test_multiple_unmatched_delimiters(self):
-        """Test multiple unmatched delimiters"""
+        """Test that only the last, unmatched delimiter is literal"""
         node = TextNode("**bold1** and **bold2", TextType.PLAIN)
         
-        with self.assertRaises(ValueError) as context:
-            split_nodes_delimiter([node], "**", TextType.BOLD)
+        result = split_nodes_delimiter([node], "**", TextType.BOLD)
         
-        self.assertIn("Unmatched delimiter", str(context.exception))
+        self.assertEqual(result, [
+            TextNode("bold1", TextType.BOLD),
+            TextNode(" and **bold2", TextType.PLAIN),
+        ])
     
     def test_chaining_multiple_delimiter_types(self):
         """Test chaining multiple delimiter processing"""
@@ -331,6 +331,27 @@ class TestSplitNodesImageLink(unittest.TestCase):
         self.assertListEqual(image_result, expected_image)
         self.assertListEqual(link_result, expected_link)
 
+    
+    def test_split_links_cuts_at_matched_link_not_image_text(self):
+        """Test that an image spelled like a link is not split as one"""
+        node = TextNode("![same](u) and [same](u)", TextType.PLAIN)
+        result = split_nodes_link([node])
+        
+        expected = [
+            TextNode("![same](u) and ", TextType.PLAIN),
+            TextNode("same", TextType.LINK, "u"),
+        ]
+        self.assertListEqual(result, expected)
+    
+    def test_split_many_links(self):
+        """Test a link-dense node, such as an index page"""
+        node = TextNode("".join(f"[{i}](/p/{i}) " for i in range(500)), TextType.PLAIN)
+        result = split_nodes_link([node])
+        
+        self.assertEqual(len(result), 1000)
+        self.assertEqual(result[998], TextNode("499", TextType.LINK, "/p/499"))
+        self.assertEqual(result[999], TextNode(" ", TextType.PLAIN))
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
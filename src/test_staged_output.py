@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+from staged_output import StagedOutput
+from test_support import read_file, write_file
+
+
+class TestStagedOutput(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.live = os.path.join(self.tmp.name, "docs")
+        self.builds = os.path.join(self.tmp.name, ".builds")
+        self.staged = StagedOutput(self.live, self.builds, keep=1)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _build(self, content):
+        staging = self.staged.prepare()
+        path = os.path.join(staging, "index.html")
+        if os.path.exists(path):
+            os.remove(path)
+        write_file(path, content)
+        return self.staged.publish()
+
+    def test_publish_swaps_symlink(self):
+        build = self._build("v1")
+        self.assertTrue(os.path.islink(self.live))
+        self.assertTrue(os.path.samefile(self.live, build))
+        self.assertEqual(read_file(os.path.join(self.live, "index.html")), "v1")
+
+    def test_staging_is_seeded_from_live_build(self):
+        self._build("v1")
+        write_file(os.path.join(self.live, "extra.css"), "css")
+        staging = self.staged.prepare()
+        self.assertEqual(read_file(os.path.join(staging, "extra.css")), "css")
+
+    def test_live_site_unchanged_until_publish(self):
+        self._build("v1")
+        staging = self.staged.prepare()
+        os.remove(os.path.join(staging, "index.html"))
+        write_file(os.path.join(staging, "index.html"), "v2")
+        self.assertEqual(read_file(os.path.join(self.live, "index.html")), "v1")
+        self.staged.publish()
+        self.assertEqual(read_file(os.path.join(self.live, "index.html")), "v2")
+
+    def test_plain_directory_is_migrated(self):
+        write_file(os.path.join(self.live, "index.html"), "old")
+        self._build("new")
+        self.assertTrue(os.path.islink(self.live))
+        self.assertEqual(read_file(os.path.join(self.live, "index.html")), "new")
+
+    def test_prune_keeps_requested_builds(self):
+        for version in ("v1", "v2", "v3"):
+            self._build(version)
+        self.assertEqual(len(self.staged.builds()), 2)
+
+    def test_rollback(self):
+        self._build("v1")
+        self._build("v2")
+        self.staged.rollback()
+        self.assertEqual(read_file(os.path.join(self.live, "index.html")), "v1")
+        with self.assertRaises(ValueError):
+            self.staged.rollback()
+
+    def test_prune_drops_rolled_back_build(self):
+        good = self._build("good")
+        bad = self._build("bad")
+        self.staged.rollback()
+        self._build("next")
+        self.assertFalse(os.path.exists(bad))
+        self.assertTrue(os.path.exists(good))
+        self.assertEqual(self.staged.rollback(), good)
+        self.assertEqual(read_file(os.path.join(self.live, "index.html")), "good")
+
+    def test_clear_removes_symlink_and_builds(self):
+        self._build("v1")
+        self._build("v2")
+        self.staged.clear()
+        self.assertFalse(os.path.lexists(self.live))
+        self.assertFalse(os.path.exists(self.builds))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from static_sync import sync_static
+from test_support import read_file, write_file
+
+
+class TestSyncStatic(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.src = os.path.join(self.tmp.name, "static")
+        self.dest = os.path.join(self.tmp.name, "docs")
+        write_file(os.path.join(self.src, "index.css"), "body {}")
+        write_file(os.path.join(self.src, "images", "a.png"), "aaaa")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _sync(self, *args, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return sync_static(*args, **kwargs)
+
+    def test_initial_sync_copies_everything(self):
+        result = self._sync(self.src, self.dest)
+        self.assertEqual((result.copied, result.unchanged, result.removed), (2, 0, 0))
+        self.assertEqual(result.files, {"index.css", os.path.join("images", "a.png")})
+        self.assertEqual(read_file(os.path.join(self.dest, "images", "a.png")), "aaaa")
+
+    def test_second_sync_copies_nothing(self):
+        first = self._sync(self.src, self.dest)
+        result = self._sync(self.src, self.dest, first.files)
+        self.assertEqual((result.copied, result.unchanged, result.removed), (0, 2, 0))
+
+    def test_changed_file_is_copied(self):
+        first = self._sync(self.src, self.dest)
+        write_file(os.path.join(self.src, "index.css"), "body { color: red }")
+        result = self._sync(self.src, self.dest, first.files)
+        self.assertEqual(result.copied, 1)
+        self.assertEqual(read_file(os.path.join(self.dest, "index.css")), "body { color: red }")
+
+    def test_checksum_ignores_touched_identical_file(self):
+        first = self._sync(self.src, self.dest)
+        os.utime(os.path.join(self.src, "index.css"), (0, 0))
+        self.assertEqual(self._sync(self.src, self.dest, first.files, checksum=True).copied, 0)
+        self.assertEqual(self._sync(self.src, self.dest, first.files).copied, 1)
+
+    def test_deleted_source_is_removed(self):
+        first = self._sync(self.src, self.dest)
+        os.remove(os.path.join(self.src, "images", "a.png"))
+        result = self._sync(self.src, self.dest, first.files)
+        self.assertEqual(result.removed, 1)
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "images")))
+
+    def test_generated_files_are_left_alone(self):
+        first = self._sync(self.src, self.dest)
+        page = os.path.join(self.dest, "index.html")
+        write_file(page, "<html></html>")
+        self._sync(self.src, self.dest, first.files)
+        self.assertTrue(os.path.exists(page))
+
+
+if __name__ == "__main__":
+    unittest.main()
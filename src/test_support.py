@@ -0,0 +1,14 @@
+import os
+
+
+def write_file(path, content):
+    """Write a text file for a test, creating its directory if needed."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+def read_file(path, mode='r'):
+    """Return the contents of a file, as bytes with mode='rb'."""
+    with open(path, mode) as f:
+        return f.read()
@@ -1,7 +1,7 @@
 import unittest
 from textnode import TextNode, TextType
 from leafnode import LeafNode
-from text_node_to_html_node import text_node_to_html_node
+from text_node_to_html_node import text_node_to_html_node, text_nodes_to_html
 
 
 class TestTextNodeToHTMLNode(unittest.TestCase):
@@ -187,6 +187,51 @@ class TestTextNodeToHTMLNode(unittest.TestCase):
             self.assertEqual(html_node.props["src"], url)
 
 
+
+class TestTextNodesToHTML(unittest.TestCase):
+
+    def test_matches_leaf_nodes(self):
+        """Test that the direct emitter renders like the LeafNode conversion"""
+        text_nodes = [
+            TextNode("Plain ", TextType.PLAIN),
+            TextNode("bold", TextType.BOLD),
+            TextNode("italic", TextType.ITALIC),
+            TextNode("code", TextType.CODE),
+            TextNode("link", TextType.LINK, "https://example.com"),
+            TextNode("alt", TextType.IMAGE, "/images/a.png"),
+            TextNode("", TextType.BOLD),
+        ]
+        expected = "".join(text_node_to_html_node(node).to_html() for node in text_nodes)
+        self.assertEqual(text_nodes_to_html(text_nodes), expected)
+
+    def test_empty_list(self):
+        self.assertEqual(text_nodes_to_html([]), "")
+
+    def test_collects_root_relative_urls(self):
+        """Test that only root-relative link and image URLs are collected"""
+        text_nodes = [
+            TextNode("home", TextType.LINK, "/index.html"),
+            TextNode("out", TextType.LINK, "https://example.com"),
+            TextNode("anchor", TextType.LINK, "#top"),
+            TextNode("logo", TextType.IMAGE, "/images/logo.png"),
+        ]
+        urls = []
+        text_nodes_to_html(text_nodes, urls)
+        self.assertEqual(urls, ["/index.html", "/images/logo.png"])
+
+    def test_missing_url_raises_error(self):
+        with self.assertRaises(ValueError) as context:
+            text_nodes_to_html([TextNode("Bad link", TextType.LINK, None)])
+        self.assertEqual(str(context.exception), "Link TextNode must have a URL")
+        with self.assertRaises(ValueError) as context:
+            text_nodes_to_html([TextNode("Alt", TextType.IMAGE, None)])
+        self.assertEqual(str(context.exception), "Image TextNode must have a URL")
+
+    def test_unsupported_type_raises_error(self):
+        with self.assertRaises(ValueError):
+            text_nodes_to_html([TextNode("x", "underline")])
+
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -1,6 +1,22 @@
 import unittest
+from unittest import mock
+import text_to_textnodes as text_to_textnodes_module
 from textnode import TextNode, TextType
+from markdown_to_html_node import markdown_to_html_node
+from parse_warnings import ParseWarnings, current_warnings
 from text_to_textnodes import text_to_textnodes
+from split_nodes_delimiter import split_nodes_delimiter
+from split_nodes_image_link import split_nodes_image, split_nodes_link
+
+
+def split_pipeline(text):
+    """The splitter pipeline that text_to_textnodes replaces"""
+    nodes = [TextNode(text, TextType.PLAIN)]
+    nodes = split_nodes_image(nodes)
+    nodes = split_nodes_link(nodes)
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    return split_nodes_delimiter(nodes, "`", TextType.CODE)
 
 
 class TestTextToTextNodes(unittest.TestCase):
@@ -195,6 +211,19 @@ class TestTextToTextNodes(unittest.TestCase):
         ]
         self.assertEqual(result, expected)
     
+    def test_nested_brackets_and_parentheses(self):
+        """Test links with nested brackets and URLs with parentheses"""
+        text = "See [Foo [disambiguation]](https://en.wikipedia.org/wiki/Foo_(bar)) and ![a (b)](c(d).png)"
+        result = text_to_textnodes(text)
+        
+        expected = [
+            TextNode("See ", TextType.PLAIN),
+            TextNode("Foo [disambiguation]", TextType.LINK, "https://en.wikipedia.org/wiki/Foo_(bar)"),
+            TextNode(" and ", TextType.PLAIN),
+            TextNode("a (b)", TextType.IMAGE, "c(d).png"),
+        ]
+        self.assertEqual(result, expected)
+    
     def test_real_world_paragraph(self):
         """Test a realistic paragraph with mixed formatting"""
         text = """Welcome to our `Python` **tutorial**! This guide covers _advanced techniques_ 
@@ -244,5 +273,99 @@ class TestTextToTextNodes(unittest.TestCase):
         self.assertEqual(result, expected)
 
 
+class TestMatchesSplitPipeline(unittest.TestCase):
+    
+    def test_same_nodes_as_split_pipeline(self):
+        """The single-pass scanner must produce exactly the pipeline's nodes"""
+        texts = [
+            "a***b***c",
+            "a****b",
+            "a____b",
+            "**bold with _underscore_ and `tick`**",
+            "_italic with `tick`_ then `code`",
+            "![img](u)[link](v)",
+            "!![img](u) and ![not [an] image](x) [ok](y)",
+            "[a](b![c)](d)",
+            "text with [link](u) and ![image](v) and **bold**",
+            "*single* stars stay",
+            "",
+        ]
+        for text in texts:
+            with self.subTest(text=text):
+                self.assertEqual(text_to_textnodes(text), split_pipeline(text))
+    
+    def test_intraword_underscores_are_literal(self):
+        """snake_case_identifier is text, not an italic "case" """
+        self.assertEqual(text_to_textnodes("a snake_case_identifier and _this_"), [
+            TextNode("a snake_case_identifier and ", TextType.PLAIN),
+            TextNode("this", TextType.ITALIC),
+        ])
+
+
+class TestUnmatchedDelimiters(unittest.TestCase):
+    
+    def test_unmatched_delimiters_become_literal(self):
+        """Texts the pipeline used to reject keep their delimiters as text"""
+        cases = [
+            ("**unclosed bold", [TextNode("**unclosed bold", TextType.PLAIN)]),
+            ("snake_case", [TextNode("snake_case", TextType.PLAIN)]),
+            ("x _a**b**c", [
+                TextNode("x _a", TextType.PLAIN),
+                TextNode("b", TextType.BOLD),
+                TextNode("c", TextType.PLAIN),
+            ]),
+            ("`a _b_ c", [
+                TextNode("`a ", TextType.PLAIN),
+                TextNode("b", TextType.ITALIC),
+                TextNode(" c", TextType.PLAIN),
+            ]),
+            ("**bold ![img](u) around**", [
+                TextNode("**bold ", TextType.PLAIN),
+                TextNode("img", TextType.IMAGE, "u"),
+                TextNode(" around**", TextType.PLAIN),
+            ]),
+            ("_italic [link](u) around_", [
+                TextNode("_italic ", TextType.PLAIN),
+                TextNode("link", TextType.LINK, "u"),
+                TextNode(" around_", TextType.PLAIN),
+            ]),
+            ("**bold with `code` inside", [
+                TextNode("**bold with ", TextType.PLAIN),
+                TextNode("code", TextType.CODE),
+                TextNode(" inside", TextType.PLAIN),
+            ]),
+        ]
+        for text, expected in cases:
+            with self.subTest(text=text):
+                self.assertEqual(text_to_textnodes(text), expected)
+    
+    def test_warning_has_file_and_line(self):
+        """Each unmatched delimiter is reported against the page and block"""
+        with ParseWarnings("content/page.md") as warnings:
+            html = markdown_to_html_node("# Title\n\nFine text\nthen **oops").to_html()
+        self.assertEqual(html, "<div><h1>Title</h1><p>Fine text then **oops</p></div>")
+        self.assertEqual([str(warning) for warning in warnings], [
+            "content/page.md:3: unmatched '**' treated as literal text",
+        ])
+    
+    def test_no_warnings_without_collector(self):
+        """Parsing outside a ParseWarnings block records nothing"""
+        self.assertIsNone(current_warnings())
+        text_to_textnodes("**oops")
+    
+    def test_many_unmatched_delimiters_stay_linear(self):
+        """Recovering from unmatched delimiters never rescans text repeatedly"""
+        text = "** ` _ " * 20000
+        markup = len(text_to_textnodes_module.SPECIAL_CHARACTERS.findall(text))
+        with mock.patch.object(text_to_textnodes_module, "SPECIAL_CHARACTERS",
+                               mock.Mock(wraps=text_to_textnodes_module.SPECIAL_CHARACTERS)) as special:
+            nodes = text_to_textnodes(text)
+        self.assertEqual(sum(node.text_type == TextType.BOLD for node in nodes), 10000)
+
+        # Each delimiter type rescans a stretch at most once, so the scanner
+        # stops at a markup character a bounded number of times per character;
+        # rescanning after every reopen would be quadratic
+        self.assertLessEqual(special.search.call_count, 4 * markup + 1)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -23,6 +23,11 @@ class TestTextNode(unittest.TestCase):
         node2 = TextNode("Link text", TextType.LINK, "https://azure.com")
         self.assertNotEqual(node1, node2)
 
+    def test_no_instance_dict(self):
+        node = TextNode("Link text", TextType.LINK, "https://google.com")
+        self.assertFalse(hasattr(node, "__dict__"))
+        self.assertEqual(repr(node), "TextNode(Link text, link, https://google.com)")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,112 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from asset_materializer import AssetMaterializer
+from build_manifest import BuildManifest
+from watcher import Watcher, diff_snapshots
+from test_support import write_file
+
+
+class TestDiffSnapshots(unittest.TestCase):
+
+    def test_changed_added_and_deleted(self):
+        old = {"a": (1, 10), "b": (1, 10), "c": (1, 10)}
+        new = {"a": (1, 10), "b": (2, 10), "d": (1, 5)}
+        self.assertEqual(diff_snapshots(old, new), (["b", "d"], ["c"]))
+
+
+class TestWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = self.tmp.name
+        self.content = os.path.join(root, "content")
+        self.static = os.path.join(root, "static")
+        self.template = os.path.join(root, "template.html")
+        self.dest = os.path.join(root, "docs")
+        write_file(os.path.join(self.content, "index.md"), "# Home")
+        write_file(os.path.join(self.content, "blog", "index.md"), "# Blog\n\n![a](/a.png)")
+        write_file(os.path.join(self.static, "a.png"), "png")
+        write_file(os.path.join(self.static, "index.css"), "body {}")
+        write_file(self.template, "<title>{{ Title }}</title>{{ Content }}")
+        self.manifest = BuildManifest(os.path.join(root, "manifest.json"), self.static, self.dest)
+        self.watcher = Watcher(self.content, self.static, self.template, self.dest, "/",
+                               self.manifest, AssetMaterializer("copy"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _rebuild(self, changed, deleted=()):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return self.watcher.rebuild(changed, list(deleted))
+
+    def test_markdown_change_rebuilds_one_page(self):
+        page = os.path.join(self.content, "blog", "index.md")
+        self.assertEqual(self._rebuild([page]), 1)
+        self.assertTrue(os.path.exists(os.path.join(self.dest, "blog", "index.html")))
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "index.html")))
+
+    def test_repeated_edits_reuse_unchanged_blocks(self):
+        page = os.path.join(self.content, "blog", "index.md")
+        self._rebuild([page])
+        write_file(page, "# Blog\n\n![a](/a.png)\n\nNew paragraph")
+        self._rebuild([page])
+        session = self.watcher.sessions[page]
+        self.assertEqual((session.reparsed, session.reused), (3, 2))
+        with open(os.path.join(self.dest, "blog", "index.html")) as f:
+            self.assertIn("<p>New paragraph</p>", f.read())
+
+    def test_asset_change_copies_one_file(self):
+        asset = os.path.join(self.static, "index.css")
+        self.assertEqual(self._rebuild([asset]), 1)
+        self.assertEqual(self.manifest.static_files, ["index.css"])
+        self.assertTrue(os.path.exists(os.path.join(self.dest, "index.css")))
+
+    def test_asset_change_rebuilds_referencing_pages(self):
+        self._rebuild([os.path.join(self.content, "index.md"),
+                       os.path.join(self.content, "blog", "index.md")])
+        self.manifest.save()
+        asset = os.path.join(self.static, "a.png")
+        write_file(asset, "new png")
+        self.assertEqual(self._rebuild([asset]), 2)
+
+    def test_template_change_rebuilds_every_page(self):
+        write_file(self.template, "<h1>{{ Title }}</h1>{{ Content }}")
+        self.assertEqual(self._rebuild([self.template]), 2)
+        with open(os.path.join(self.dest, "index.html"), 'r') as f:
+            self.assertTrue(f.read().startswith("<h1>Home</h1>"))
+
+    def test_deleted_markdown_removes_page(self):
+        page = os.path.join(self.content, "index.md")
+        self._rebuild([page])
+        os.remove(page)
+        self.assertEqual(self._rebuild([], [page]), 1)
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "index.html")))
+
+    def test_poll_detects_changes(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(self.watcher.poll(), 0)
+            write_file(os.path.join(self.content, "new.md"), "# New")
+            self.assertEqual(self.watcher.poll(), 1)
+        self.assertTrue(os.path.exists(os.path.join(self.dest, "new.html")))
+
+    def test_failed_rebuild_is_reported_and_retried_on_next_save(self):
+        page = os.path.join(self.content, "draft.md")
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            write_file(page, "No title yet")
+            self.assertEqual(self.watcher.poll(), 0)
+            self.assertEqual(self.watcher.poll(), 0)
+            write_file(os.path.join(self.content, "other.md"), "# Other")
+            self.assertEqual(self.watcher.poll(), 1)
+            write_file(page, "# Draft\n\nNow titled")
+            self.assertEqual(self.watcher.poll(), 1)
+        self.assertEqual(output.getvalue().count(f"Error rebuilding {page}: No h1 header found"), 1)
+        with open(os.path.join(self.dest, "draft.html")) as f:
+            self.assertIn("<p>Now titled</p>", f.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
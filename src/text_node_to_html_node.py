@@ -29,3 +29,77 @@ def text_node_to_html_node(text_node):
 
     else:
         raise ValueError(f"Unsupported TextType: {text_node.text_type}")
+
+
+# Direct emitters: each renders one TextNode to the same HTML that
+# text_node_to_html_node(node).to_html() gives, without creating a LeafNode
+def _tagged(tag):
+    opening_tag = f"<{tag}>"
+    closing_tag = f"</{tag}>"
+
+    def emit(text_node):
+        return opening_tag + text_node.text + closing_tag
+
+    return emit
+
+
+def _emit_plain(text_node):
+    return text_node.text
+
+
+def _emit_link(text_node):
+    if text_node.url is None:
+        raise ValueError("Link TextNode must have a URL")
+    return f'<a href="{text_node.url}">{text_node.text}</a>'
+
+
+def _emit_image(text_node):
+    if text_node.url is None:
+        raise ValueError("Image TextNode must have a URL")
+    return f'<img src="{text_node.url}" alt="{text_node.text}"></img>'
+
+
+# The types whose url ends up in an href/src attribute
+_URL_TYPES = (TextType.LINK, TextType.IMAGE)
+
+TEXT_NODE_EMITTERS = {
+    TextType.PLAIN: _emit_plain,
+    TextType.BOLD: _tagged("b"),
+    TextType.ITALIC: _tagged("i"),
+    TextType.CODE: _tagged("code"),
+    TextType.LINK: _emit_link,
+    TextType.IMAGE: _emit_image,
+}
+
+
+def text_nodes_to_html(text_nodes, urls=None):
+    """
+    Render a list of TextNodes straight to an HTML string.
+
+    Produces the same HTML as converting each node with
+    text_node_to_html_node and joining their to_html(), but looks up the
+    emitter for each node in TEXT_NODE_EMITTERS instead of building a
+    LeafNode (and its props dict) per node.
+
+    Args:
+        text_nodes (list): TextNodes to render, in order
+        urls (list): Optional list to append the root-relative link and
+            image URLs to, as collect_root_urls would find them
+
+    Returns:
+        str: The rendered HTML
+
+    Example:
+        Input: [TextNode("Hi ", TextType.PLAIN), TextNode("you", TextType.BOLD)]
+        Output: "Hi <b>you</b>"
+    """
+    parts = []
+    for text_node in text_nodes:
+        emit = TEXT_NODE_EMITTERS.get(text_node.text_type)
+        if emit is None:
+            raise ValueError(f"Unsupported TextType: {text_node.text_type}")
+        parts.append(emit(text_node))
+        if (urls is not None and text_node.text_type in _URL_TYPES
+                and text_node.url.startswith("/")):
+            urls.append(text_node.url)
+    return "".join(parts)
@@ -1,8 +1,24 @@
+import re
 from textnode import TextNode, TextType
+from extract_markdown import LinkScanner
+from parse_warnings import warn
 from split_nodes_delimiter import split_nodes_delimiter
 from split_nodes_image_link import split_nodes_image, split_nodes_link
 
 
+# Characters that can start inline markup; everything else is plain text
+SPECIAL_CHARACTERS = re.compile(r"[!\[*_`]")
+
+# Delimiters in the order the original splitter pipeline applied them
+DELIMITERS = {
+    "*": ("**", TextType.BOLD),
+    "_": ("_", TextType.ITALIC),
+    "`": ("`", TextType.CODE),
+}
+
+DELIMITER_FOR_TYPE = {text_type: delimiter for delimiter, text_type in DELIMITERS.values()}
+
+
 def text_to_textnodes(text):
     """
     Convert raw markdown text into a list of TextNode objects.
@@ -28,40 +44,135 @@ def text_to_textnodes(text):
             TextNode("code", TextType.CODE)
         ]
     
-    Processing Order:
-        1. Start with single PLAIN node containing all text
-        2. Split out images (![alt](url))
-        3. Split out links ([anchor](url))  
-        4. Split out bold text (**bold**)
-        5. Split out italic text (_italic_)
-        6. Split out code text (`code`)
+    Algorithm:
+        A left-to-right scan that jumps between markup characters. For text
+        whose delimiters all pair up, it produces the same nodes as running
+        split_nodes_image, split_nodes_link and split_nodes_delimiter for
+        **, _ and ` one after another:
+        
+        - Images and links win over delimiters: an image or link found while
+          a delimiter is still open leaves that delimiter unmatched
+        - Inside **bold**, _ and ` are literal text
+        - Inside _italic_, ` is literal, but ** cuts the italic run short
+        - Inside `code`, ** and _ cut the code run short
+        - Text between two delimiters is only emitted if it is non-empty
         
-    Why This Order Matters:
-        - Images and links first: They have complex syntax that could interfere with delimiters
-        - Bold/italic/code last: Simple delimiters are processed after complex patterns
-        - Order within delimiters doesn't matter much, but bold -> italic -> code is logical
+        As in CommonMark, an _ between two letters or digits
+        (snake_case_identifier) is literal, and an opening delimiter that
+        turns out to be unmatched is kept as literal text rather than
+        failing the build; a warning is recorded (see parse_warnings).
+        Scanning then resumes just after that delimiter. Inside a run, every
+        delimiter of the run's own type would have closed it, so each type
+        rescans any stretch of text at most once and the scan stays linear.
     """
-    # Step 1: Start with a single PLAIN node containing all the text
-    nodes = [TextNode(text, TextType.PLAIN)]
+    nodes = []
+    length = len(text)
     
-    # Step 2: Split out images first (most complex syntax)
-    nodes = split_nodes_image(nodes)
+    # Type and offset of the delimiter run currently open (None while in
+    # plain text), and where the pending plain text starts
+    open_type = None
+    open_at = 0
+    run_start = 0
     
-    # Step 3: Split out links (also complex syntax)  
-    nodes = split_nodes_link(nodes)
+    # Images are found ahead of time, one leftmost match at a time, so that
+    # links never swallow an image that starts inside them
+    scanner = LinkScanner(text)
+    images = scanner.images()
+    next_image = next(images, None)
     
-    # Step 4: Split out bold text (delimiter: **)
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    
-    # Step 5: Split out italic text (delimiter: _)
-    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
-    
-    # Step 6: Split out code text (delimiter: `)
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    position = 0
+    while True:
+        match = SPECIAL_CHARACTERS.search(text, position)
+        if match is None:
+            if open_type is None:
+                break
+            # Reached the end with a run still open
+            position = _reopen(open_type, open_at)
+            open_type = None
+            continue
+        position = match.start()
+        char = text[position]
+        
+        if next_image is not None and position == next_image.start:
+            if open_type is not None:
+                position = _reopen(open_type, open_at)
+                open_type = None
+                continue
+            _append_plain(nodes, text, run_start, position)
+            nodes.append(TextNode(next_image.label, TextType.IMAGE, next_image.url))
+            position = run_start = next_image.end
+            next_image = next(images, None)
+            continue
+        
+        if char == "[":
+            # Links are matched only up to the next image, like the original
+            # pipeline that looked for links in the text between images
+            end = next_image.start if next_image is not None else length
+            link = scanner.link_at(position, end)
+            if link is not None:
+                if open_type is not None:
+                    position = _reopen(open_type, open_at)
+                    open_type = None
+                    continue
+                _append_plain(nodes, text, run_start, position)
+                nodes.append(TextNode(link.label, TextType.LINK, link.url))
+                position = run_start = link.end
+                continue
+            position += 1
+            continue
+        
+        if char == "!" or (char == "*" and not text.startswith("**", position)):
+            position += 1
+            continue
+        
+        if (char == "_" and 0 < position < length - 1 and
+                text[position - 1].isalnum() and text[position + 1].isalnum()):
+            # Intraword underscore
+            position += 1
+            continue
+        
+        delimiter, text_type = DELIMITERS[char]
+        
+        if open_type is None:
+            open_type = text_type
+            open_at = position
+        elif open_type == text_type:
+            _append_plain(nodes, text, run_start, open_at)
+            if position > open_at + len(delimiter):
+                nodes.append(TextNode(text[open_at + len(delimiter):position], text_type))
+            open_type = None
+            run_start = position + len(delimiter)
+        elif open_type == TextType.BOLD or (open_type == TextType.ITALIC and
+                                            text_type == TextType.CODE):
+            # Literal inside bold, and ` is literal inside italic
+            position += 1
+            continue
+        else:
+            # ** inside italic or code, or _ inside code: the open run
+            # can no longer be closed
+            position = _reopen(open_type, open_at)
+            open_type = None
+            continue
+        
+        position += len(delimiter)
     
+    _append_plain(nodes, text, run_start, length)
     return nodes
 
 
+def _append_plain(nodes, text, start, end):
+    if end > start:
+        nodes.append(TextNode(text[start:end], TextType.PLAIN))
+
+
+def _reopen(open_type, open_at):
+    # The run opened at open_at cannot be closed: its delimiter stays in the
+    # pending plain text and scanning resumes right after it
+    delimiter = DELIMITER_FOR_TYPE[open_type]
+    warn(f"unmatched '{delimiter}' treated as literal text")
+    return open_at + len(delimiter)
+
+
 # Example usage and demonstration
 if __name__ == "__main__":
     print("Text to TextNodes Examples:\n")
@@ -174,8 +285,7 @@ if __name__ == "__main__":
     
     # Example 8: Performance characteristics
     print("Example 8: Performance notes")
-    print("Each processing step:")
-    print("  - Operates on the result of the previous step")
-    print("  - Only processes PLAIN nodes (other nodes pass through unchanged)")
-    print("  - Maintains O(n) complexity where n is text length")
-    print("  - Results in clean separation of concerns")
\ No newline at end of file
+    print("text_to_textnodes gives the same result as the split pipeline above, but:")
+    print("  - Scans the text once, jumping straight between markup characters")
+    print("  - Only slices out each node's text once, instead of once per pass")
+    print("  - Does not rebuild the node list five times")
\ No newline at end of file
@@ -11,6 +11,10 @@ class TextType(Enum):
 
 class TextNode:
 
+    # Slots instead of a per-instance __dict__: every inline span creates a
+    # TextNode, so their size adds up over a large build
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text, text_type, url=None):
         
         self.text = text
@@ -0,0 +1,245 @@
+import contextlib
+import os
+import time
+from compiled_template import CompiledTemplate
+from generate_page import generate_page, generate_pages_recursive, dest_path_for
+from parse_session import ParseSession
+from static_sync import walk_files, remove_empty_dirs
+from dependency_graph import DependencyGraph
+
+
+def snapshot(paths):
+    """
+    Record (mtime, size) for every file under the given files and directories.
+
+    Returns:
+        dict: path -> (st_mtime_ns, st_size)
+    """
+    state = {}
+    for path in paths:
+        if os.path.isdir(path):
+            files = [os.path.join(path, relative) for relative in walk_files(path)]
+        elif os.path.exists(path):
+            files = [path]
+        else:
+            files = []
+        for file_path in files:
+            try:
+                stat = os.stat(file_path)
+            except FileNotFoundError:
+                continue
+            state[file_path] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+
+def diff_snapshots(old, new):
+    """Return (changed, deleted): paths added or modified, and paths removed."""
+    changed = sorted(path for path, state in new.items() if old.get(path) != state)
+    deleted = sorted(path for path in old if path not in new)
+    return changed, deleted
+
+
+class Watcher:
+    """
+    Keep a warm build process and rebuild only what a change affects.
+
+    The content, static and template paths are polled for modification
+    time and size changes (the standard library has no portable file
+    notification API). Each change is routed to the narrowest rebuild:
+
+        content/*.md   -> regenerate (or remove) that one page
+        static/*       -> recopy (or remove) that one asset, and regenerate
+                          the pages that reference it
+        template.html  -> recompile the template and regenerate every page
+
+    A file whose rebuild raises is reported and skipped; the watcher keeps
+    running, and the file is rebuilt again the next time it is saved.
+    """
+
+    def __init__(self, content_dir, static_dir, template_path, dest_dir,
+                 basepath, manifest, materializer, interval=0.5, block_cache=None):
+        self.content_dir = content_dir
+        self.static_dir = static_dir
+        self.template_path = template_path
+        self.dest_dir = dest_dir
+        self.basepath = basepath
+        self.manifest = manifest
+        self.materializer = materializer
+        self.interval = interval
+        self.block_cache = block_cache
+        # One ParseSession per edited page, so an edit re-parses only the
+        # blocks it touched
+        self.sessions = {}
+        # Errors raised by the last rebuild, by path
+        self.errors = {}
+        # Path -> the (mtime, size) (None if deleted) whose rebuild failed
+        self.failed = {}
+        self.template = CompiledTemplate.from_file(template_path, basepath)
+        self.state = snapshot(self._watched_paths())
+
+    def _watched_paths(self):
+        return [self.content_dir, self.static_dir, self.template_path]
+
+    def _is_under(self, path, directory):
+        return os.path.commonpath([os.path.abspath(path), os.path.abspath(directory)]) == os.path.abspath(directory)
+
+    def poll(self):
+        """Check for changes once and rebuild what they affect."""
+        new_state = snapshot(self._watched_paths())
+        changed, deleted = diff_snapshots(self.state, new_state)
+        # A failed path waits for its next save rather than failing again
+        # on every poll
+        changed = [path for path in changed if self.failed.get(path, ()) != new_state[path]]
+        deleted = [path for path in deleted if self.failed.get(path, ()) is not None]
+        if not changed and not deleted:
+            return 0
+
+        newest_change = max((new_state[path][0] for path in changed), default=time.time_ns())
+        outputs = self.rebuild(changed, deleted)
+        self.manifest.save()
+
+        for path in changed + deleted:
+            if path not in self.errors:
+                self.failed.pop(path, None)
+                continue
+            # Keep the state from before the change, so the path still
+            # counts as changed until it rebuilds
+            self.failed[path] = new_state.get(path)
+            if path in self.state:
+                new_state[path] = self.state[path]
+            else:
+                new_state.pop(path, None)
+        self.state = new_state
+
+        latency_ms = (time.time_ns() - newest_change) / 1e6
+        print(f"Updated {outputs} outputs for {len(changed) + len(deleted)} changed files "
+              f"({latency_ms:.1f} ms from change to output)")
+        return outputs
+
+    def rebuild(self, changed, deleted):
+        """
+        Rebuild the outputs that depend on the given changed and deleted files.
+
+        An error raised while rebuilding one path is printed and recorded
+        in self.errors, and the other paths are still rebuilt.
+
+        Returns:
+            int: Number of outputs written or removed
+        """
+        outputs = 0
+        self.errors = {}
+        graph = DependencyGraph.from_manifest_entries(self.manifest.entries)
+
+        if self.template_path in changed or self.template_path in deleted:
+            if not os.path.exists(self.template_path):
+                print(f"Template {self.template_path} is missing; waiting for it to return")
+                return 0
+            rebuilt = self.manifest.rebuilt
+            with self._reporting(self.template_path):
+                self.template = CompiledTemplate.from_file(self.template_path, self.basepath)
+                self.manifest.invalidate_template(self.template_path)
+                generate_pages_recursive(self.content_dir, self.template_path, self.dest_dir,
+                                         self.basepath, self.manifest, block_cache=self.block_cache)
+            outputs += self.manifest.rebuilt - rebuilt
+            if self.template_path not in self.errors:
+                changed = [path for path in changed if not self._is_under(path, self.content_dir)]
+
+        for path in changed:
+            if path == self.template_path:
+                continue
+            with self._reporting(path):
+                outputs += self._rebuild_changed(graph, path)
+
+        for path in deleted:
+            with self._reporting(path):
+                outputs += self._rebuild_deleted(graph, path)
+
+        return outputs
+
+    @contextlib.contextmanager
+    def _reporting(self, path):
+        """Print and record an error raised while rebuilding a path."""
+        try:
+            yield
+        except Exception as e:
+            print(f"Error rebuilding {path}: {e}")
+            self.errors[path] = e
+
+    def _rebuild_changed(self, graph, path):
+        """Regenerate the page or recopy the asset for a changed file."""
+        outputs = 0
+        if self._is_under(path, self.content_dir):
+            if path.endswith('.md'):
+                dest_path = dest_path_for(path, self.content_dir, self.dest_dir)
+                if generate_page(path, self.template_path, dest_path, self.basepath,
+                                 self.manifest, self.template, block_cache=self._session(path)):
+                    outputs += 1
+        elif self._is_under(path, self.static_dir):
+            relative_path = os.path.relpath(path, self.static_dir)
+            dest_path = os.path.join(self.dest_dir, relative_path)
+            print(f"Copying file: {path} -> {dest_path}")
+            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+            self.materializer.materialize(path, dest_path)
+            if relative_path not in self.manifest.static_files:
+                self.manifest.static_files.append(relative_path)
+            outputs += 1
+            outputs += self._rebuild_dependents(graph, path)
+        return outputs
+
+    def _rebuild_deleted(self, graph, path):
+        """Remove the page or asset built from a deleted file."""
+        outputs = 0
+        if self._is_under(path, self.content_dir):
+            if not path.endswith('.md'):
+                return 0
+            dest_path = dest_path_for(path, self.content_dir, self.dest_dir)
+            self.manifest.forget(dest_path)
+            self.sessions.pop(path, None)
+        elif self._is_under(path, self.static_dir):
+            relative_path = os.path.relpath(path, self.static_dir)
+            dest_path = os.path.join(self.dest_dir, relative_path)
+            if relative_path in self.manifest.static_files:
+                self.manifest.static_files.remove(relative_path)
+            outputs += self._rebuild_dependents(graph, path)
+        else:
+            return 0
+        if os.path.exists(dest_path):
+            print(f"Removing {dest_path}")
+            os.remove(dest_path)
+            remove_empty_dirs(os.path.dirname(dest_path), self.dest_dir)
+            outputs += 1
+        return outputs
+
+    def _session(self, source_path):
+        """The ParseSession for a page, ready for its next version."""
+        session = self.sessions.get(source_path)
+        if session is None:
+            session = self.sessions[source_path] = ParseSession(self.block_cache)
+        session.begin()
+        return session
+
+    def _rebuild_dependents(self, graph, asset_path):
+        """Regenerate the pages that reference a changed static asset."""
+        self.manifest.invalidate_asset(asset_path)
+        outputs = 0
+        for key in graph.stale_outputs([asset_path]):
+            source_path = self.manifest.entries[key]["source_path"]
+            dest_path = self.manifest.output_path(key)
+            if os.path.exists(source_path) and generate_page(
+                    source_path, self.template_path, dest_path, self.basepath,
+                    self.manifest, self.template, block_cache=self._session(source_path)):
+                outputs += 1
+        return outputs
+
+    def run(self):
+        print(f"Watching {', '.join(self._watched_paths())} for changes (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(self.interval)
+                self.poll()
+        except KeyboardInterrupt:
+            print("Stopped watching")
+        finally:
+            self.manifest.save()
+            if self.block_cache is not None and self.block_cache.path is not None:
+                self.block_cache.save()